@@ -0,0 +1,318 @@
+""" benchmarks for the engineering_conversions module
+
+run it as a script to time the regression cases, the hot paths of eng_float() and eng_str()
+and compare them with the baseline file, if there is one
+
+python bench_engineering_conversions.py            compare with the baseline
+python bench_engineering_conversions.py --save     and then make this run the new baseline
+python bench_engineering_conversions.py --extras   the comparisons with older and array versions
+
+the exit status is 1 if any case is slower than the baseline by more than --threshold percent
+only the standard library is needed, the array extras need numpy, and skip without it
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import threading
+import time
+import timeit
+
+import engineering_conversions as ec
+
+version = '1.0     October 2026'
+
+
+def best_of(func, number, repeat=5):
+    """ return the best time per call of func, in seconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat))/number
+
+
+def report(name, per_value, baseline=None):
+    line = '{:40s} {:10.3f} us/value'.format(name, per_value*1e6)
+    if baseline:
+        line += '   x{:.1f}'.format(baseline/per_value)
+    print(line)
+
+
+def table_values(n=100000, seed=1):
+    """ a column of plausible measurements, spread over the whole prefix range"""
+    rng = random.Random(seed)
+    return [rng.choice((-1, 1))*rng.uniform(1, 1000)*10**rng.randint(-15, 12) for _ in range(n)]
+
+
+def mixed_strings(n=100000, bad=0.1, seed=1):
+    """ engineering strings like '4k7' and '1.2meg', with a sprinkling of plain floats and junk"""
+    rng = random.Random(seed)
+    junk = ('N/A', '14.3mm', '', '1t', '1.2m3', '--', 'k')
+    mults = ('k', 'M', 'G', 'm', 'u', 'n', 'p', 'meg', 'Mega', 'da', ec.MICRO_SIGN)
+    out = []
+    for _ in range(n):
+        r = rng.random()
+        if r<bad:
+            out.append(rng.choice(junk))
+        elif r<2*bad:
+            out.append(repr(rng.uniform(-1000, 1000)))
+        elif r<0.6:
+            out.append('{}{}{}'.format(rng.randint(1, 999), rng.choice(mults), rng.randint(0, 99)))
+        else:
+            out.append('{:.3g}{}'.format(rng.uniform(1, 999), rng.choice(mults)))
+    return out
+
+
+def legacy_eng_float(x_org):
+    """ eng_float() as it was in version 2.0.1, float() first, then scan the dicts twice"""
+    if len(x_org)==0:
+        raise ValueError('no input, nothing to do')
+    try:
+        return float(x_org)
+    except ValueError:
+        pass
+    x = x_org.strip()
+    cand = None
+    for search_in in (ec.longest_weights, ec.long_weights, ec.weights):
+        if cand:
+            break
+        for suffix in search_in:
+            if cand:
+                break
+            if x.endswith(suffix):
+                cand = suffix
+                cand_weight = search_in[suffix]
+    if cand:
+        x = x[:(-len(cand))]+'e'+str(cand_weight)
+        try:
+            return float(x)
+        except ValueError:
+            pass
+        raise ValueError('"{}" found suffix "{}" but "{}" not parsed'.format(x_org, cand, x))
+    cand = None
+    for search_in in (ec.longest_weights, ec.long_weights, ec.weights):
+        if cand:
+            break
+        for infix in search_in:
+            if cand:
+                break
+            pos = x.find(infix)
+            if pos >= 0:
+                cand = infix
+                cand_weight = search_in[infix]
+    if cand:
+        x = x[:pos]+'.'+x[(pos+len(cand)):]+'e'+str(cand_weight)
+        try:
+            return float(x)
+        except ValueError:
+            pass
+        raise ValueError('"{}" found infix "{}" but "{}" not parsed'.format(x_org, cand, x))
+    raise ValueError('could not parse "{}" as float, no multiplier found'.format(x_org))
+
+
+def convert_all(func, strings):
+    out = []
+    for s in strings:
+        try:
+            out.append(func(s))
+        except ValueError:
+            out.append(None)
+    return out
+
+
+def bench_eng_float(n=100000):
+    """ the compiled parser against the 2.0.1 float()-then-scan, on clean and dirty data"""
+    for bad in (0.0, 0.1, 0.3):
+        strings = mixed_strings(n, bad)
+        old = best_of(lambda: convert_all(legacy_eng_float, strings), 1, 3)/n
+        new = best_of(lambda: convert_all(ec.eng_float, strings), 1, 3)/n
+        report('2.0.1 eng_float, {:.0%} junk'.format(bad), old)
+        report('eng_float, {:.0%} junk'.format(bad), new, old)
+
+
+def bench_eng_str_array(n=100000):
+    """ eng_str() called per value against eng_str_array() on the whole column"""
+    try:
+        import numpy as np
+    except ImportError:
+        print('numpy not available, skipping eng_str_array')
+        return
+    values = table_values(n)
+    arr = np.array(values)
+    for kwargs in ({}, {'digits':3}, {'infix':True, 'show_trailing_zeros':True}):
+        scalar = best_of(lambda: [ec.eng_str(v, **kwargs) for v in values], 1, 3)/n
+        vector = best_of(lambda: ec.eng_str_array(arr, **kwargs), 1, 3)/n
+        name = 'eng_str {}'.format(kwargs or 'defaults')
+        report(name, scalar)
+        report('eng_str_array {}'.format(kwargs or 'defaults'), vector, scalar)
+
+
+def bench_eng_str_engines(n=100000):
+    """ the arithmetic engine against the e format engine, which give the same strings"""
+    values = table_values(n)
+    for options in ({}, {'digits':3}, {'digits':12, 'infix':True}):
+        e_format = ec.EngFormatter(engine='e_format', **options)
+        arith = ec.EngFormatter(engine='arith', **options)
+        if list(map(e_format, values))!=list(map(arith, values)):
+            print('ENGINES DIFFER for', options)
+        old = best_of(lambda: list(map(e_format, values)), 1, 3)/n
+        new = best_of(lambda: list(map(arith, values)), 1, 3)/n
+        report('e_format engine {}'.format(options or 'defaults'), old)
+        report('arith engine {}'.format(options or 'defaults'), new, old)
+
+
+def bench_eng_str_threads(n=20000, max_threads=8):
+    """ format from several threads at once, each with its own options
+
+    checks that no thread sees another's settings, and reports the total throughput
+    the throughput only scales with threads on a free-threaded build of CPython
+    """
+    option_sets = [{'digits':d, 'micro':mu, 'mega':mg, 'infix':inf}
+                   for d in (3, 6) for mu in ('u', ec.MICRO_SIGN) for (mg, inf) in (('M', False), ('meg', True))]
+    values = table_values(n)
+    expected = [[ec.eng_str(v, **opts) for v in values] for opts in option_sets]
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print('eng_str threads, GIL {}'.format('enabled' if gil else 'disabled'))
+    threads = 1
+    single = None
+    while threads <= max_threads:
+        crossed = []
+        def work(k):
+            opts = option_sets[k%len(option_sets)]
+            got = [ec.eng_str(v, **opts) for v in values]
+            if got != expected[k%len(option_sets)]:
+                crossed.append(k)
+        pool = [threading.Thread(target=work, args=(k,)) for k in range(threads)]
+        t0 = time.perf_counter()
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter()-t0
+        rate = threads*n/elapsed
+        single = single or rate
+        print('{:3d} threads {:12.0f} values/s   x{:.2f}   {}'.format(threads, rate, rate/single,
+                                                                   'CROSSED' if crossed else 'ok'))
+        threads *= 2
+
+
+
+# the regression cases, each one a batch of inputs that exercises one path
+# keep the names stable, they are the keys in the baseline file
+
+FLOAT_CASES = {
+    'eng_float float() path': ['1.5', '-3e-3', '42', '0.001', '+7.25', '1E3', '6.02e23', '-0'],
+    'eng_float suffix': ['4.7k', '100n', '2.2u', '-3M', '.5m', '10G', '33p', '1.k'],
+    'eng_float infix': ['4k7', '12u6', '2M2', '-1m5', '3n3', '6p8', '1G2', 'k5'],
+    'eng_float long multipliers': ['1Mega', '2meg', '3da', '4MEG5', '1mega5', '7Meg', '2da5', '9MEGA'],
+    'eng_float micro signs': ['4.7' + ec.MICRO_SIGN, '2' + ec.GREEK_MU + '2', '1' + ec.MICRO_SIGN, '3u3'],
+    'eng_float errors': ['N/A', '14.3mm', '', '1t', '1.2m3', '--', 'm', 'inf k'],
+}
+
+STR_VALUES = [3, 1.2e3, 30e3, -0.007, 314159, 4e-6, 999.9996e3, 2.5e-13, 4e12, 1e-30]
+
+STR_CASES = {
+    'eng_str defaults': {},
+    'eng_str digits=1': {'digits':1},
+    'eng_str digits=3': {'digits':3},
+    'eng_str digits=12': {'digits':12},
+    'eng_str digits=30': {'digits':30},
+    'eng_str limits=(0,0)': {'limits':(0, 0)},
+    'eng_str limits=(-24,24)': {'limits':(-24, 24)},
+    'eng_str infix': {'infix':True},
+    'eng_str trailing zeros, plus': {'show_trailing_zeros':True, 'show_plus':True},
+}
+
+
+def convert_each(func, strings):
+    for s in strings:
+        try:
+            func(s)
+        except ValueError:
+            pass
+
+
+def regression_cases(repeat=100):
+    """ return {name: (func, values per call)}, for every regression case"""
+    cases = {}
+    for name, strings in FLOAT_CASES.items():
+        strings = strings*repeat
+        cases[name] = ((lambda strings=strings: convert_each(ec.eng_float, strings)), len(strings))
+    values = STR_VALUES*repeat
+    for name, options in STR_CASES.items():
+        cases[name] = ((lambda options=options: [ec.eng_str(v, **options) for v in values]), len(values))
+    return cases
+
+
+def run_cases(repeat=5):
+    """ return {name: seconds per value} for every regression case"""
+    return {name: best_of(func, 1, repeat)/n for name, (func, n) in regression_cases().items()}
+
+
+def save_baseline(results, filename):
+    baseline = {'module version': ec.version,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'us per value': {name: t*1e6 for name, t in results.items()}}
+    with open(filename, 'w') as f:
+        json.dump(baseline, f, indent=2)
+
+
+def compare(results, filename, threshold):
+    """ print each case against the baseline, and return the names of those that got slower"""
+    with open(filename) as f:
+        saved = json.load(f)
+    baseline = saved['us per value']
+    print('baseline of engineering_conversions {}, now {}'.format(saved.get('module version'), ec.version))
+    slower = []
+    print('{:35s} {:>10s} {:>10s} {:>8s}'.format('case', 'baseline', 'now', 'change'))
+    for name, t in results.items():
+        now = t*1e6
+        if name not in baseline:
+            print('{:35s} {:>10s} {:10.3f}      new'.format(name, '', now))
+            continue
+        change = 100*(now-baseline[name])/baseline[name]
+        flag = ''
+        if change>threshold:
+            flag = '  SLOWER'
+            slower.append(name)
+        print('{:35s} {:10.3f} {:10.3f} {:+7.1f}%{}'.format(name, baseline[name], now, change, flag))
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='benchmark engineering_conversions')
+    parser.add_argument('--baseline', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         'bench_engineering_conversions.json'),
+                        help='the baseline file to compare with, or save to')
+    parser.add_argument('--save', action='store_true', help='save this run as the baseline')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='percentage slowdown that counts as a regression, default 10')
+    parser.add_argument('--extras', action='store_true',
+                        help='run the comparison benchmarks instead of the regression cases')
+    args = parser.parse_args(argv)
+
+    if args.extras:
+        bench_eng_float()
+        bench_eng_str_engines()
+        bench_eng_str_array()
+        bench_eng_str_threads()
+        return 0
+
+    results = run_cases()
+    slower = []
+    if os.path.exists(args.baseline):
+        slower = compare(results, args.baseline, args.threshold)
+    else:
+        for name, t in results.items():
+            report(name, t)
+    if args.save:
+        save_baseline(results, args.baseline)
+        print('saved baseline to', args.baseline)
+    return 1 if slower else 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
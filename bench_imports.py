@@ -0,0 +1,97 @@
+""" import time budgets for the modules here, measured with python -X importtime
+
+run it as a script to print the import time of each module against its budget
+
+python bench_imports.py
+
+each module is imported in a fresh interpreter, a few times, and the quickest taken
+the exit status is 1 if any module is over budget, or imports something it mustn't,
+like tkinter from a module that is meant to be headless
+
+>>> over_budget()
+[]
+"""
+
+import os
+import subprocess
+import sys
+
+version = '1.0     October 2026'
+
+# cumulative import time budgets, in milliseconds, with room for slow machines
+# and for compiling the source when there's no __pycache__ to use
+BUDGETS = {
+    'engineering_conversions': 100,
+    'quantiser': 50,      # about 7 ms from __pycache__, the rest is compiling the solvers
+    'gui_conversions': 25,
+    'gui_io_widget': 25,
+    'gui_input_widget': 25,
+}
+
+# modules that must not be imported along with these
+HEADLESS = ('tkinter', 'Tkinter', '_tkinter')
+
+
+def import_times(module, repeat=3):
+    """ return (milliseconds, names), the quickest import of module, and every module it imported"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import '+module],
+                                cwd=here, capture_output=True, text=True, check=True)
+        names = []
+        total = None
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            fields = line[len('import time:'):].split('|')
+            if not fields[0].strip().isdigit():      # the column headings
+                continue
+            name = fields[2].strip()
+            names.append(name)
+            if name==module:
+                total = int(fields[1])/1000
+        if total is None:
+            raise ValueError('no import time found for {}'.format(module))
+        if best is None or total<best[0]:
+            best = (total, names)
+    return best
+
+
+def gui_imports(names, headless=HEADLESS):
+    """ return the names that a headless module shouldn't have imported"""
+    return [name for name in names if name.split('.')[0] in headless]
+
+
+def over_budget(budgets=None, headless=HEADLESS):
+    """ return a list of (module, problem) for each module over its budget, or importing a GUI"""
+    problems = []
+    for module, budget in (budgets or BUDGETS).items():
+        ms, names = import_times(module)
+        if ms>budget:
+            problems.append((module, '{:.1f} ms, budget {} ms'.format(ms, budget)))
+        gui = gui_imports(names, headless)
+        if gui:
+            problems.append((module, 'imports {}'.format(', '.join(gui))))
+    return problems
+
+
+def main():
+    failed = False
+    print('{:30s} {:>8s} {:>8s}'.format('module', 'ms', 'budget'))
+    for module, budget in BUDGETS.items():
+        ms, names = import_times(module)
+        gui = gui_imports(names)
+        flag = ''
+        if ms>budget:
+            flag = '  OVER'
+        if gui:
+            flag += '  imports {}'.format(', '.join(gui))
+        failed = failed or bool(flag)
+        print('{:30s} {:8.1f} {:8d}{}'.format(module, ms, budget, flag))
+    return 1 if failed else 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
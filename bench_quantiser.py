@@ -0,0 +1,177 @@
+""" benchmarks for the quantiser module
+
+run it as a script to time the Quantiser against the make_quant() closure of version 1.0,
+one value at a time, and on whole numpy arrays
+
+python bench_quantiser.py
+
+only the standard library is needed, the array timings need numpy, and skip without it
+"""
+
+import math
+import random
+import sys
+import timeit
+
+import quantiser as qu
+
+version = '1.0     October 2026'
+
+
+def best_of(func, number, repeat=5):
+    """ return the best time per call of func, in seconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat))/number
+
+
+def report(name, per_value, baseline=None):
+    line = '{:40s} {:10.3f} us/value'.format(name, per_value*1e6)
+    if baseline:
+        line += '   x{:.1f}'.format(baseline/per_value)
+    print(line)
+
+
+def legacy_make_quant(basis):
+    """ make_quant() as it was in version 1.0, a closure with a hand-written binary search"""
+    def quant(x, nearest=0, offset=0):
+        x_test = abs(x)
+        if x_test<1e-100:
+            return 0
+        if x<0:
+            sign = -1
+        else:
+            sign = 1
+        base0 = basis[0]
+        base1 = basis[-1]
+        lbm1 = len(basis)-1
+        exp = math.floor(math.log(x_test)/math.log(base1))
+        x_test *= base1**(-exp)
+        ilow = 0
+        ihigh = lbm1
+        while ihigh-ilow > 1:
+            imid = int((ilow+ihigh)/2)
+            if x_test> basis[imid]:
+                ilow = imid
+            else:
+                ihigh = imid
+        s = int(nearest)
+        if s==0:
+            highrat = basis[ihigh]/x_test
+            lowrat = x_test/basis[ilow]
+            if lowrat<highrat:
+                index = ilow
+            else:
+                index = ihigh
+        elif s>0:
+            index = ihigh
+        else:
+            index = ilow
+        index += offset
+        while index<0:
+            index += lbm1
+            exp -= 1
+        while index>=lbm1:
+            index -= lbm1
+            exp += 1
+        return(sign*basis[index]*(base1**exp))
+    return quant
+
+
+def spread_values(n=100000, seed=1):
+    """ values spread over the whole of the electronics range, both signs"""
+    rng = random.Random(seed)
+    return [rng.choice((-1, 1))*rng.uniform(1, 1000)*10**rng.randint(-15, 9) for _ in range(n)]
+
+
+def bench_scalar(n=100000):
+    """ one value at a time, the 1.0 closure against the Quantiser"""
+    values = spread_values(n)
+    for name in ('qE12', 'qE48', 'qE192'):
+        new = getattr(qu, name, None)
+        if new is None:
+            continue
+        old = legacy_make_quant(list(new.basis))
+        for nearest, offset in ((0, 0), (-1, 0), (1, 3)):
+            old_t = best_of(lambda: [old(v, nearest, offset) for v in values], 1, 3)/n
+            new_t = best_of(lambda: [new(v, nearest, offset) for v in values], 1, 3)/n
+            label = '{} nearest={} offset={}'.format(name, nearest, offset)
+            report('1.0 '+label, old_t)
+            report(label, new_t, old_t)
+
+
+def bench_array(n=1000000):
+    """ the Quantiser on a numpy array, against calling it for each value"""
+    try:
+        import numpy as np
+    except ImportError:
+        print('numpy not available, skipping arrays')
+        return
+    values = spread_values(n)
+    arr = np.array(values)
+    for name in ('qE12', 'qE96'):
+        q = getattr(qu, name)
+        scalar = best_of(lambda: [q(v) for v in values], 1, 1)/n
+        vector = best_of(lambda: q(arr), 1, 3)/n
+        report('{} each value'.format(name), scalar)
+        report('{} array'.format(name), vector, scalar)
+
+
+def agreement(n=100000):
+    """ print how often the Quantiser differs from the 1.0 closure, on a correctly ordered basis
+
+    floor now returns an exact basis value, where 1.0 returned the one below it, and the
+    nearest choice is made on the midpoint, so the odd tie lands differently"""
+    values = spread_values(n)
+    for name in ('qE12', 'qE24', 'qE48'):
+        new = getattr(qu, name)
+        old = legacy_make_quant(list(new.basis))
+        for nearest in (-1, 0, 1):
+            differ = sum(1 for v in values if not math.isclose(old(v, nearest), new(v, nearest)))
+            print('{} nearest={:2d}  {} of {} differ'.format(name, nearest, differ, n))
+
+
+def pair_agreement(n=1000, seed=1):
+    """ return how many of n random targets pairs() and pairs_array() don't get the k best for,
+    against trying every pair of values in the table they search
+
+    >>> pair_agreement(100)
+    0
+    """
+    rng = random.Random(seed)
+    differ = 0
+    for _ in range(n):
+        q = rng.choice((qu.qE12, qu.qE24, qu.qE96))
+        k = rng.choice((1, 3, 5))
+        how = rng.choice((('series', 'parallel'), ('series',), ('parallel',)))
+        target = 10**rng.uniform(-3, 7)
+        values = qu._pair_table(q, 3)[0]
+        exp, t = q.split(target)
+        every = []
+        for i, a in enumerate(values):
+            for b in values[i:]:
+                if 'series' in how:
+                    every.append(abs(a+b-t))
+                if 'parallel' in how:
+                    every.append(abs(a*b/(a+b)-t))
+        best = sorted(every)[:k]
+        scale = target/t
+        found = sorted(abs(p.value-target)/scale for p in qu.pairs(target, q, k, how))
+        found_array = sorted(abs(qu.pairs_array([target], q, k, how).value[0]-target)/scale)
+        for errors in (found, found_array):
+            if len(errors)!=len(best) or any(not math.isclose(e, b, rel_tol=1e-9, abs_tol=1e-12)
+                                             for e, b in zip(errors, best)):
+                differ += 1
+                break
+    return differ
+
+
+def main():
+    bench_scalar()
+    bench_array()
+    agreement()
+    print('pairs() missing the k best for {} of 1000 targets'.format(pair_agreement()))
+    return 0
+
+
+
+if __name__ == '__main__':
+    sys.exit(main())
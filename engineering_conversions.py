@@ -5,6 +5,23 @@ eng_float() which behaves like float()
 eng_str() which behaves like str()
 but use engineering powers of 1000, and BIPM text multipliers like k and G
 
+EngFormatter is eng_str() with its options fixed in advance, safe to share between threads
+EngCache remembers the results of both, for streams that repeat the same values
+eng_float_status() never raises, it returns a STATUS_ code for why a string didn't parse
+eng_float_unit() reads a unit as well, '100nF' gives (1e-07, 'F'), and eng_float_units() a list of them
+
+eng_float_rows() and eng_float_file() convert columns of csv files too big to load
+eng_scan() and eng_scan_file() pull every number out of raw bytes, like a log file
+eng_float_many() and eng_str_many() share big conversions between processes
+eng_read_stream() and eng_write_stream() decode and encode lines like 'V1=3u3' over asyncio streams
+
+and for bulk work on numpy arrays (numpy is only imported when these are used)
+eng_float_array() which converts a whole array of strings in a few passes
+eng_float_status_array() which does the same, with a status code for each string
+eng_str_array() which formats a whole array of floats
+
+eng_column() formats a column of numbers with one shared multiplier, lined up for tables
+
 In the spirit of 'talk exact, listen forgiving', eng_float() understands all prefixes
 defined by BIPM, both unicode micro characters, and strings like meg and Mega used by SPICE
 
@@ -44,7 +61,19 @@ of the authors and should not be interpreted as representing official policies,
 either expressed or implied, of the FreeBSD Project.
 """
 
-version = '2.0.1   Dec 2016'
+version = '2.1.0   Oct 2026'
+
+import array
+import collections
+import contextlib
+import csv
+import functools
+import itertools
+import math
+import mmap
+import os
+import re
+import threading
 
 MICRO_SIGN = '\u00B5'
 GREEK_MU = '\u03BC'
@@ -79,8 +108,90 @@ weights['d'] = -1             # add the non-3 BIPM SI prefixes, because we can
 weights['c'] = -2             # and it makes listening more forgiving
 weights['h'] = 2
 
+OHM_SIGN = '\u2126'
+GREEK_OMEGA = '\u03A9'
+
+# the units that eng_float_unit() knows, each spelling mapped to the symbol it returns
+# a letter that is both a multiplier and a unit is read as the multiplier, as eng_float()
+# would, so '10m' is 10 milli, and it takes '10mm' to get 10 milli metres
+units = {'V':'V', 'A':'A', 'W':'W', 'VA':'VA', 'F':'F', 'H':'H', 'Hz':'Hz',
+         GREEK_OMEGA:GREEK_OMEGA, OHM_SIGN:GREEK_OMEGA, 'ohm':GREEK_OMEGA, 'Ohm':GREEK_OMEGA,
+         'ohms':GREEK_OMEGA, 'R':GREEK_OMEGA, 'S':'S', 'C':'C', 'J':'J', 'K':'K', 's':'s', 'm':'m'}
+
         
 
+# the parser behind eng_float(), compiled from the tables above, once, at load time
+# it accepts exactly the strings that float() would accept after the multiplier is
+# swapped for an exponent, so the scan only has to run when things go wrong
+# if you add to the weights dicts, rebuild these four from _compile_parser() to pick them up
+
+_DIGITS = r'\d(?:_?\d)*'     # underscores are allowed between digits, as float() does
+
+def _alternation(keys):
+    """ return a regex matching any of keys, trying them in the order given"""
+    # runs of single characters go into a class, which is much quicker to match
+    alternatives = []
+    singles = ''
+    for key in keys:
+        if len(key)==1:
+            singles += re.escape(key)
+            continue
+        if singles:
+            alternatives.append('['+singles+']')
+            singles = ''
+        alternatives.append(re.escape(key))
+    if singles:
+        alternatives.append('['+singles+']')
+    return '|'.join(alternatives)
+
+
+def _compile_parser():
+    """ return the match and search functions, and the weights of every multiplier, long to short"""
+    keys = {}
+    for search_in in (longest_weights, long_weights, weights):
+        for key in search_in:
+            keys.setdefault(key, search_in[key])
+    alternatives = _alternation(keys)
+    # sign, whole, point, frac, multiplier, and the digits after an infix
+    pattern = r'([+-]?)({d})?(\.({d})?)?({k})({d})?'.format(d=_DIGITS, k=alternatives)
+    return re.compile(pattern).fullmatch, re.compile(alternatives).search, keys
+
+_eng_match, _eng_search, _eng_weights = _compile_parser()
+_eng_suffixes = tuple(_eng_weights)
+
+_POW10 = tuple(10**n for n in range(350))
+
+
+def _scaled(sign, whole, frac, weight, underscore='_'):
+    """ return sign whole.frac * 10**weight, rounded exactly as float() would
+
+    the digits are put together as an integer and scaled with integer arithmetic,
+    which python rounds correctly on conversion to float, just as float() does a string
+    whole and frac can be str or bytes, with underscore to match"""
+    if frac is None:
+        digits = whole
+        places = weight
+    else:
+        places = weight-len(frac)
+        if underscore in frac:
+            places += frac.count(underscore)
+        digits = frac if whole is None else whole+frac
+    if len(digits)>300:     # int() has a limit on digits, float() does not
+        parts = [p.decode() if isinstance(p, bytes) else p or '' for p in (whole, frac)]
+        return float('{}{}.{}e{}'.format(sign, parts[0], parts[1], weight))
+    n = int(digits)
+    try:
+        if places>=0:
+            value = float(n*_POW10[places])
+        else:
+            value = n/_POW10[-places]
+    except OverflowError:
+        value = math.inf
+    if sign=='-':
+        return -value
+    return value
+
+
 # what *ck-wit at BIPM thought Exa would make a good multiplier
 # when 'e' was already in use for exponents???
 # this means that '34E3' will be interpretted as 34000, rather than 34.3 Exa
@@ -90,6 +201,9 @@ def eng_str(x, digits=6, limits=(-12,9), micro='u', mega='M',
            infix=False, show_plus=False, show_trailing_zeros=False):
     """Return a formatted string, using powers of 1000, and BIPM engineering multipliers
 
+    the work is done by an EngFormatter, cached for each combination of options
+    nothing global is written, so it can be called from many threads at once
+
     digits      integer, defaults to 6
                 <1 corrected to 1, large values honoured
 
@@ -166,94 +280,347 @@ def eng_str(x, digits=6, limits=(-12,9), micro='u', mega='M',
     
     """
 
+    return _cached_formatter(digits, tuple(limits), micro, mega,
+                             infix, show_plus, show_trailing_zeros)(x)
 
 
-    # don't be silly
-    digits = int(digits)      # is this defensive? are we going to get a float?
-    if digits<1:
-        digits=1
-
-    # let the e format do the heavy lifting
-    # force a + sign to regularise the format
-    # though we still have to look for the e as the exp field width can vary
-
-    e_str = '{:+.{fdigits}e}'.format(x, fdigits=digits-1)
 
-    # now pull the fields apart
-    sign = e_str[0]
-    ipart = e_str[1]
-    dp = '.'
-    fpart = e_str[3:(digits+2)]
-    exp = int(e_str[e_str.find('e')+1:])
+@functools.lru_cache(maxsize=256)
+def _cached_formatter(*options):
+    """ the formatters behind eng_str(), one per combination of options"""
+    return EngFormatter(*options)
 
-    # print('raw e format    ', sign, ipart, dp, fpart, exp)
 
-    # find whether exp is a factor of 3, and adjust if not
-    adjustment = exp%3
-    # beef up length of fpart if it needs it
-    while len(fpart)<adjustment:
-        fpart += '0'
-    # transfer digits from fpart to ipart
-    ipart += fpart[:adjustment]
-    fpart = fpart[adjustment:]
-    # and fix the exponent
-    exp -= adjustment
 
-    # print('normed to 3     ', sign, ipart, dp, fpart, exp)
+class EngFormatter:
+    """A precompiled eng_str(), with all the formatting options fixed when it's made
 
-    # optionally take off the trailing zeros
-    if not show_trailing_zeros:
-        fpart = fpart.rstrip('0')
-    # and kill the decimal point if the fractional part has gone
-    if not(fpart):
-        dp = ''
+    the options are those of eng_str(), with the same defaults
+    the prefix table, the clamped limits and the format spec are worked out once, here,
+    and nothing is written after __init__, so a formatter can be shared freely
+    between threads, and different formatters can run side by side
 
+    >>> f = EngFormatter(digits=3, micro=MICRO_SIGN)
+    >>> [f(n) for n in (314159, 4.7e-6, -0.5, 3e15)]
+    ['314k', '4.7µ', '-500m', '3e+15']
 
-    # print('removed zeros   ', sign, ipart, dp, fpart, exp)
+    the module ms dict is copied, not written to, so changes to it after a formatter
+    is made are not seen by that formatter
 
-    # now we have to figure out exactly how to format this puppy
-    # I am going to try to minimise if then else try except special cases
-    # and just make it run a standard process
+    there are two engines, which give identical strings
+    engine='arith', the default, rounds the digits with integer arithmetic
+    engine='e_format' lets the e format round, and cuts its output up, as eng_str() always did
 
-    # find the limits that we are going to use, and shield the dict
-    hilim = min(max(limits), 24)
-    lolim = max(min(limits), -24)
-
-    # deal with the +6 and -6 special cases by putting them into the dict
-    ms[6] = mega
-    ms[-6] = micro
-
-    # deal with the special case of 0 for infix/postfix use by putting into dict
-    # print('infix is ', infix)
-    if infix:
-        ms[0] = '.'
-    else:
-        ms[0] = ''
-
-    # is substitution possible?
-    can_subs = lolim <= exp <= hilim
-    # print('can we substitute?', can_subs)
-    if not can_subs:
-        mult = 'e{:+}'.format(exp)
-
-    # remove the plus if we don't need it
-    if (not show_plus) and (sign=='+'):
-        sign = ''
-
-    # finally
-    # if we can make an infix substitution
-    if infix and can_subs:
-        # print('doing infix subs')
-        return '{}{}{}{}'.format(sign, ipart, ms[exp], fpart)
+    >>> values = (999.9996e3, 0.125, -0.0, 5e-324, 1.7976931348623157e308, 314159)
+    >>> [EngFormatter(digits=d)(v) for d in (1, 2, 6) for v in values] == \\
+    ...     [EngFormatter(digits=d, engine='e_format')(v) for d in (1, 2, 6) for v in values]
+    True
+    """
 
-    # if we can make a postfix substitution
-    if can_subs:
-        # print('doing postfix subs')
-        return '{}{}{}{}{}'.format(sign, ipart, dp, fpart, ms[exp])
+    __slots__ = ('digits', 'limits', 'micro', 'mega', 'infix', 'show_plus',
+                 'show_trailing_zeros', 'engine', '_lolim', '_hilim', '_prefixes',
+                 '_e_format', '_plus', '_lower', '_upper', '_engine')
+
+    def __init__(self, digits=6, limits=(-12,9), micro='u', mega='M',
+                 infix=False, show_plus=False, show_trailing_zeros=False, engine='arith'):
+
+        # don't be silly
+        digits = int(digits)      # is this defensive? are we going to get a float?
+        if digits<1:
+            digits=1
+
+        self.digits = digits
+        self.limits = tuple(limits)
+        self.micro = micro
+        self.mega = mega
+        self.infix = infix
+        self.show_plus = show_plus
+        self.show_trailing_zeros = show_trailing_zeros
+
+        # find the limits that we are going to use
+        self._hilim = min(max(limits), 24)
+        self._lolim = max(min(limits), -24)
+
+        # our own copy of the multipliers, with the +6, -6 and 0 special cases put in
+        prefixes = dict(ms)
+        prefixes[6] = mega
+        prefixes[-6] = micro
+        # 0 is a decimal point for infix, and nothing at all for postfix
+        if infix:
+            prefixes[0] = '.'
+        else:
+            prefixes[0] = ''
+        self._prefixes = prefixes
+
+        # force a + sign to regularise the format
+        self._e_format = '{{:+.{}e}}'.format(digits-1).format
+
+        self._plus = '+' if show_plus else ''
+        # the range a rounded coefficient of digits digits must lie in
+        self._lower = 10**(digits-1)
+        self._upper = 10**digits
+
+        engines = {'arith':EngFormatter._format_arith, 'e_format':EngFormatter._format_e}
+        if engine not in engines:
+            raise ValueError('engine must be one of {}, got {!r}'.format(list(engines), engine))
+        self.engine = engine
+        self._engine = engines[engine]
+
+    def __repr__(self):
+        return ('EngFormatter(digits={}, limits={}, micro={!r}, mega={!r}, infix={}, '
+                'show_plus={}, show_trailing_zeros={}, engine={!r})').format(self.digits, self.limits,
+                    self.micro, self.mega, self.infix, self.show_plus, self.show_trailing_zeros, self.engine)
+
+    def __call__(self, x):
+        """ return x formatted as a string"""
+        return self._engine(self, x)
+
+    def _format_arith(self, x):
+        """ the arithmetic engine
+
+        the engineering exponent and the rounded digits are worked out with integers,
+        from the exact value of x, and the string is put together in one go"""
+
+        if type(x) is not float:
+            if not isinstance(x, (int, float)):
+                return self._format_e(x)     # Decimals and the like know how to format themselves
+            x = float(x)                     # which is what the e format does with an int
+
+        if x>0:
+            sign = self._plus
+        elif x<0:
+            sign = '-'
+            x = -x
+        elif x==0:
+            sign = '-' if math.copysign(1.0, x)<0 else self._plus
+        else:
+            raise ValueError('cannot format nan')
+
+        digits = self.digits
+        if x==0:
+            coeff = 0
+            exp = 0
+        elif x==math.inf:
+            raise ValueError('cannot format inf')
+        else:
+            num, den = x.as_integer_ratio()
+            # log10 gets the exponent right, or within one, so check it
+            # it's right when the truncated coefficient has exactly digits digits
+            exp = math.floor(math.log10(x))
+            while True:
+                shift = digits-1-exp
+                if shift>=0:
+                    coeff, rem = divmod(num*(_POW10[shift] if shift<350 else 10**shift), den)
+                    div = den
+                else:
+                    div = den*(_POW10[-shift] if shift>-350 else 10**-shift)
+                    coeff, rem = divmod(num, div)
+                if coeff>=self._upper:
+                    exp += 1
+                elif coeff<self._lower:
+                    exp -= 1
+                else:
+                    break
+            # round half even, exactly as the e format does
+            rem += rem
+            if rem>div or (rem==div and coeff&1):
+                coeff += 1
+                # which can carry into another digit, 999.9996k becomes 1.00000M
+                if coeff==self._upper:
+                    coeff = self._lower
+                    exp += 1
+
+        # move the decimal point to make exp a factor of 3
+        adjustment = exp%3
+        exp -= adjustment
+        flen = digits-1-adjustment
+        if flen>0:
+            ipart, frac = divmod(coeff, _POW10[flen] if flen<350 else 10**flen)
+            fpart = '%0*d' % (flen, frac)
+            if not self.show_trailing_zeros:
+                fpart = fpart.rstrip('0')
+        else:
+            ipart = coeff*_POW10[-flen]     # not enough digits to fill the integer part, pad it
+            fpart = ''
+
+        if not (self._lolim <= exp <= self._hilim):
+            if fpart:
+                return '%s%d.%se%+d' % (sign, ipart, fpart, exp)
+            return '%s%de%+d' % (sign, ipart, exp)
+        if self.infix:
+            return '%s%d%s%s' % (sign, ipart, self._prefixes[exp], fpart)
+        if fpart:
+            return '%s%d.%s%s' % (sign, ipart, fpart, self._prefixes[exp])
+        return '%s%d%s' % (sign, ipart, self._prefixes[exp])
+
+    def _format_e(self, x):
+        """ the e format engine, which lets format() round, and cuts its output up"""
+
+        digits = self.digits
+
+        # let the e format do the heavy lifting
+        # though we still have to look for the e as the exp field width can vary
+        e_str = self._e_format(x)
+
+        # now pull the fields apart
+        sign = e_str[0]
+        ipart = e_str[1]
+        dp = '.'
+        fpart = e_str[3:(digits+2)]
+        exp = int(e_str[e_str.find('e')+1:])
+
+        # find whether exp is a factor of 3, and adjust if not
+        adjustment = exp%3
+        # beef up length of fpart if it needs it
+        while len(fpart)<adjustment:
+            fpart += '0'
+        # transfer digits from fpart to ipart
+        ipart += fpart[:adjustment]
+        fpart = fpart[adjustment:]
+        # and fix the exponent
+        exp -= adjustment
+
+        # optionally take off the trailing zeros
+        if not self.show_trailing_zeros:
+            fpart = fpart.rstrip('0')
+        # and kill the decimal point if the fractional part has gone
+        if not(fpart):
+            dp = ''
+
+        # remove the plus if we don't need it
+        if (not self.show_plus) and (sign=='+'):
+            sign = ''
+
+        # is substitution possible?
+        if not (self._lolim <= exp <= self._hilim):
+            # we can't make any substitution, return numeric
+            return '{}{}{}{}e{:+}'.format(sign, ipart, dp, fpart, exp)
+
+        # if we can make an infix substitution
+        if self.infix:
+            return '{}{}{}{}'.format(sign, ipart, self._prefixes[exp], fpart)
+
+        # we can make a postfix substitution
+        return '{}{}{}{}{}'.format(sign, ipart, dp, fpart, self._prefixes[exp])
+
+    def format_column(self, values, prefix=None):
+        """ return a list of strings for a column of values, all with the same multiplier
+
+        this is the engine behind eng_column(), see there for the details"""
+
+        values = [float(v) for v in values]
+        finite = [abs(v) for v in values if math.isfinite(v)]
+        biggest = max(finite, default=0.0)
+
+        # choose the shared exponent
+        if prefix is None:
+            exp = 0
+            if biggest:
+                exp = (math.floor(math.log10(biggest))//3)*3
+        elif isinstance(prefix, int):
+            exp = prefix
+        else:
+            symbols = {self._prefixes[e]:e for e in range(-24, 27, 3) if e}
+            symbols[''] = 0
+            if prefix not in symbols:
+                raise ValueError('unknown prefix {!r}, expected one of {}'.format(prefix, sorted(symbols)))
+            exp = symbols[prefix]
+        if exp%3:
+            raise ValueError('the shared exponent must be a multiple of 3, got {}'.format(exp))
+
+        if exp==0:
+            suffix = ''
+        elif self._lolim <= exp <= self._hilim:
+            suffix = self._prefixes[exp]
+        else:
+            suffix = 'e{:+}'.format(exp)
+
+        # enough decimals to give the biggest value its digits
+        scale = 10.0**exp
+        int_digits = 1
+        if biggest/scale>=1:
+            int_digits = math.floor(math.log10(biggest/scale))+1
+        decimals = max(self.digits-int_digits, 0)
+
+        spec = '{{:{}.{}f}}{}'.format('+' if self.show_plus else '', decimals, suffix).format
+        column = [spec(v/scale) for v in values]
+        width = max(map(len, column), default=0)
+        return [c.rjust(width) for c in column]
+
+    def format_array(self, x):
+        """ return a numpy array of strings, formatting every element of x
+
+        this is the engine behind eng_str_array(), and needs numpy"""
+        import numpy as np
+
+        x = np.asarray(x, dtype=np.float64)
+        shape = x.shape
+        x = x.ravel()
+        if not np.isfinite(x).all():
+            raise ValueError('cannot format inf or nan')
+        if not x.size:      # the char functions below can't take an empty float array
+            return np.empty(shape, dtype='U1')
+
+        digits = self.digits
+
+        # the e format still does the rounding, as it's the only way to get it exactly right
+        # but everything after that is done on the whole array at once
+        e_str = np.array(list(map('%+.{}e'.format(digits-1).__mod__, x.tolist())))
+        parts = np.char.partition(e_str, 'e')
+        exp = _chars_to_int(parts[:, 2])
+
+        # pull the mantissa apart into a matrix of characters, one row per number
+        width = digits+1 if digits==1 else digits+2
+        chars = np.ascontiguousarray(parts[:, 0].astype('U{}'.format(width)))
+        chars = chars.view('U1').reshape(len(x), width)
+        sign = chars[:, 0]
+        # all the significant digits, with enough zero padding to shift 2 places left
+        ndig = max(digits, 3)
+        dig = np.full((len(x), ndig), '0', dtype='U1')
+        dig[:, 0] = chars[:, 1]
+        dig[:, 1:digits] = chars[:, 3:]
+
+        adjustment = exp%3
+        exp -= adjustment
+
+        ipart = np.empty(len(x), dtype='U3')
+        fpart = np.empty(len(x), dtype='U{}'.format(ndig))
+        for adj in (0, 1, 2):      # each adjustment moves the decimal point by a fixed amount
+            rows = np.flatnonzero(adjustment==adj)
+            if not len(rows):
+                continue
+            ilen = adj+1
+            flen = max(digits, ilen)-ilen
+            ipart[rows] = _join_chars(dig[rows, :ilen])
+            if flen:
+                frac = dig[rows, ilen:ilen+flen]
+                if not self.show_trailing_zeros:
+                    # blank out every zero that has no non-zero to its right
+                    keep = np.logical_or.accumulate((frac!='0')[:, ::-1], axis=1)[:, ::-1]
+                    frac = np.where(keep, frac, '')
+                fpart[rows] = _join_chars(frac)
+        dp = np.where(np.char.str_len(fpart)>0, '.', '')
+
+        prefixes = np.array([self._prefixes[e] for e in range(-24, 27, 3)])
+
+        can_subs = (self._lolim<=exp) & (exp<=self._hilim)
+        prefix = prefixes[np.clip((exp+24)//3, 0, len(prefixes)-1)]
+        exp_str = np.char.add(np.where(exp<0, 'e-', 'e+'), np.abs(exp).astype('U3'))
+        mult = np.where(can_subs, prefix, exp_str)
+
+        if not self.show_plus:
+            sign = np.where(sign=='+', '', sign)
+
+        if self.infix:
+            mid = np.where(can_subs, prefix, dp)
+            mult = np.where(can_subs, '', mult)
+        else:
+            mid = dp
 
-    # we can't make any substitution, return numeric
-    # print('doing the default formatting')
-    return '{}{}{}{}{}'.format(sign, ipart, dp, fpart, mult)
+        out = sign
+        for piece in (ipart, mid, fpart, mult):
+            out = np.char.add(out, piece)
+        return out.reshape(shape)
 
 
 
@@ -317,34 +684,135 @@ def eng_float(x_org):
         ... 
     ValueError: "m" found suffix "m" but "e-3" not parsed
     
+    bytes are decoded as UTF-8, float() has always taken them
+    >>> [eng_float(s) for s in (b'1.5', bytearray(b'2'), b'4k7')]
+    [1.5, 2.0, 4700.0]
+
     we let float() do the heavy lifting    
     """
 
+    if isinstance(x_org, (bytes, bytearray)):
+        x_org = x_org.decode('utf-8')
     if len(x_org)==0:
         raise ValueError('no input, nothing to do')
 
+    # float() is the quickest way to deal with plain numbers, but a failed float() is
+    # expensive, so only try it first on things made of digits, signs, points and an e
+    tried = x_org.strip('+-.0123456789') in 'eE'
+    if tried:
+        try:
+            return float(x_org)
+        except ValueError:
+            pass
+
+    # the compiled parser finds the mantissa and multiplier in one go
+    value = _eng_parsed(x_org.strip())
+    if value is not None:
+        return value
+
+    if not tried:
+        try:
+            return float(x_org)
+        except ValueError:
+            pass
+
+    # so neither could make sense of it
+    # the original scan works out exactly why, for the error message
+    return _eng_float_scan(x_org)
+
+
+
+def _eng_parsed(x):
+    """ return the value of the stripped string x if it has a multiplier we can use, or None"""
+    m = _eng_match(x)
+    if m is not None:
+        sign, whole, point, frac, mult, last = m.groups()
+        if last is None:
+            if whole or frac:       # as a suffix
+                return _scaled(sign, whole, frac, _eng_weights[mult])
+        elif point is None and (mult!='E' or not whole):    # as an infix, but 1E3 is a plain float
+            return _scaled(sign, whole, last, _eng_weights[mult])
+    return None
+
+
+
+# the status codes for eng_float_status(), one for each way eng_float() can fail
+STATUS_OK = 0
+STATUS_EMPTY = 1              # no input, nothing to do
+STATUS_SUFFIX = 2             # found a suffix, but the rest didn't parse
+STATUS_INFIX = 3              # found an infix, but the rest didn't parse
+STATUS_NO_MULTIPLIER = 4      # not a float, and no multiplier found
+STATUS_NAMES = ('ok', 'empty', 'suffix not parsed', 'infix not parsed', 'no multiplier')
+
+# float()'s own syntax, so we can tell whether it will work without the expense of failing
+_float_match = re.compile(r'\s*[+-]?(?:(?:{d}(?:\.(?:{d})?)?|\.{d})(?:[eE][+-]?{d})?|inf(?:inity)?|nan)\s*'
+                          .format(d=_DIGITS), re.IGNORECASE).fullmatch
+
+
+def eng_float_status(x_org):
+    """Return (value, status) for the string x_org, without ever raising ValueError
+
+    value is what eng_float() would return, or nan where it would raise
+    status is one of the STATUS_ codes, STATUS_OK if it parsed, otherwise the reason it didn't
+    the error message isn't made, eng_float_message() will make it if it's wanted
+
+    >>> [eng_float_status(s) for s in ('4k7', '', '14.3mm', '1.2m3', 'N/A')]
+    [(4700.0, 0), (nan, 1), (nan, 2), (nan, 3), (nan, 4)]
+
+    bytes are decoded as UTF-8, as eng_float() does, bytes that aren't UTF-8 don't parse
+    >>> [eng_float_status(s) for s in (b'4k7', bytearray(b'1.5'), b'4\\xc2\\xb5', b'4\\xb5')]
+    [(4700.0, 0), (1.5, 0), (4e-06, 0), (nan, 4)]
+    """
+    if isinstance(x_org, (bytes, bytearray)):
+        x_org = x_org.decode('utf-8', 'replace')
+    if len(x_org)==0:
+        return math.nan, STATUS_EMPTY
+    if _float_match(x_org):
+        return float(x_org), STATUS_OK
+
+    x = x_org.strip()
+    value = _eng_parsed(x)
+    if value is not None:
+        return value, STATUS_OK
+
+    # it failed, so sort out why, in the order that eng_float() looks
+    if x.endswith(_eng_suffixes):
+        return math.nan, STATUS_SUFFIX
+    if _eng_search(x):
+        return math.nan, STATUS_INFIX
+    return math.nan, STATUS_NO_MULTIPLIER
+
+
+
+def eng_float_message(x_org):
+    """Return the message eng_float() would raise ValueError with for x_org, or None if it parses
+
+    >>> eng_float_message('14.3mm')
+    '"14.3mm" found suffix "m" but "14.3me-3" not parsed'
+    """
     try:
-        return float(x_org)
-    except ValueError:
-        pass
+        eng_float(x_org)
+    except ValueError as err:
+        return str(err)
+    return None
+
+
+
+def _eng_float_scan(x_org):
+    """ the multiplier search for eng_float(), one candidate at a time
+
+    this is the slow way, which works out which multiplier float() choked on,
+    used to build the error messages, and as the reference for the compiled parser"""
 
     # so float() couldn't make sense of it
     # let's whip off any non-printing characters before we start
     x = x_org.strip()
   
     # does it end in any of our pre-defined multipliers, check long to short?
-    cand = None
-    for search_in in (longest_weights, long_weights, weights):
-        if cand:
-            break
-        for suffix in search_in:
-            if cand:
+    if x.endswith(_eng_suffixes):
+        for cand, cand_weight in _eng_weights.items():
+            if x.endswith(cand):
                 break
-            if x.endswith(suffix):
-                cand = suffix
-                cand_weight = search_in[suffix]
-
-    if cand:
         # got one! remove it
         x = x[:(-len(cand))]
         # and replace it with an exponent
@@ -367,19 +835,11 @@ def eng_float(x_org):
     # need to check in the order longest to shortest
     # to avoid existing prematurely with 'm', when there's a 'mega'
         
-    cand = None
-    for search_in in (longest_weights, long_weights, weights):
-        if cand:
-            break
-        for infix in search_in:
-            if cand:
-                break
-            pos = x.find(infix)
+    if _eng_search(x):
+        for cand, cand_weight in _eng_weights.items():
+            pos = x.find(cand)
             if pos >= 0:
-                cand = infix
-                cand_weight = search_in[infix]
-
-    if cand:
+                break
         # got one! remove it
         first = x[:pos]
         last = x[(pos+len(cand)):]
@@ -402,6 +862,856 @@ def eng_float(x_org):
 
 
 
+def eng_column(values, digits=6, limits=(-12,9), micro='u', mega='M',
+               show_plus=False, prefix=None):
+    """Return a list of strings for a column of values, all sharing one multiplier
+
+    the options are those of eng_str(), digits is the number of significant figures
+    given to the biggest value, and every string gets the same number of decimals
+    the strings are padded to the same width, so the decimal points line up
+
+    prefix      defaults to None, which takes the multiplier from the biggest value
+                otherwise a prefix, like 'k' or micro, or an exponent, like 3 or -6
+
+    >>> for s in eng_column([950e3, 1.2e6, 33e3, -4.7e3], digits=3):
+    ...     print(s)
+     0.95M
+     1.20M
+     0.03M
+    -0.00M
+
+    >>> eng_column([950e3, 1.2e6, 33e3], digits=3, prefix='k')
+    [' 950k', '1200k', '  33k']
+
+    >>> eng_column([0.0022, 0.0047, 0.01], prefix=-6, micro=MICRO_SIGN, digits=2)
+    [' 2200µ', ' 4700µ', '10000µ']
+    """
+    return _cached_formatter(digits, tuple(limits), micro, mega,
+                             False, show_plus, True).format_column(values, prefix)
+
+
+
+def eng_str_array(x, digits=6, limits=(-12,9), micro='u', mega='M',
+                  infix=False, show_plus=False, show_trailing_zeros=False):
+    """Return a numpy array of strings, formatting every element of x as eng_str() would
+
+    the parameters are exactly those of eng_str(), and the output matches it string for string
+    the exponents and mantissa digits of the whole array are worked out in one go
+    needs numpy, which is only imported when this is called
+
+    raise ValueError if any element is inf or nan, as eng_str() would
+
+    >>> eng_str_array([3, 1.2e3, 30e3, -0.007, 4e12]).tolist()
+    ['3', '1.2k', '30k', '-7m', '4e+12']
+
+    >>> eng_str_array([314159, 0.1, 1], digits=8, infix=True, show_trailing_zeros=True).tolist()
+    ['314k15900', '100m00000', '1.0000000']
+
+    >>> eng_str_array([]).tolist(), eng_str_array([[], []]).shape
+    ([], (2, 0))
+    """
+    return _cached_formatter(digits, tuple(limits), micro, mega,
+                             infix, show_plus, show_trailing_zeros).format_array(x)
+
+
+
+def _chars_to_int(a):
+    """turn a numpy array of short signed integer strings like '+05' and '-100' into int64"""
+    import numpy as np
+    codes = np.ascontiguousarray(a, dtype='U4').view(np.uint32).reshape(len(a), 4)
+    value = np.zeros(len(a), dtype=np.int64)
+    for col in range(1, 4):
+        digit = codes[:, col]
+        present = digit>0
+        value = np.where(present, value*10+digit.astype(np.int64)-48, value)
+    return np.where(codes[:, 0]==ord('-'), -value, value)
+
+
+
+def _join_chars(chars):
+    """turn an (n, k) matrix of single characters into n strings, empty ones vanish"""
+    import numpy as np
+    n, k = chars.shape
+    if k==0:
+        return np.full(n, '')
+    chars = np.ascontiguousarray(chars, dtype='U1')
+    return chars.view('U{}'.format(k)).reshape(n)
+
+
+
+def _bulk_float(a):
+    """float() every element of the numpy string array a, without raising
+
+    returns (values, ok), the elements that float() rejects are nan in values
+    and False in ok
+
+    the whole array is offered to numpy in one go, and only when something in
+    it chokes do we split it in half and try again, so clean data costs one pass
+    """
+    import numpy as np
+
+    try:
+        return a.astype(np.float64), np.ones(a.shape, dtype=bool)
+    except ValueError:
+        pass
+
+    if len(a) <= 8:       # small enough to just walk through
+        values = np.full(a.shape, np.nan)
+        ok = np.zeros(a.shape, dtype=bool)
+        for i, s in enumerate(a):
+            try:
+                values[i] = float(s)
+                ok[i] = True
+            except ValueError:
+                pass
+        return values, ok
+
+    half = len(a)//2
+    lo_values, lo_ok = _bulk_float(a[:half])
+    hi_values, hi_ok = _bulk_float(a[half:])
+    return np.concatenate((lo_values, hi_values)), np.concatenate((lo_ok, hi_ok))
+
+
+
+def eng_float_array(values):
+    """Return (floats, errors) for a list or numpy array of engineering strings
+
+    floats is a float64 numpy array, the same shape as the input
+    errors is a boolean array flagging where eng_float() would have raised ValueError,
+    those elements are left as nan in floats
+
+    the inputs are sorted into groups by the suffix or infix they carry, and each
+    group is converted in one numpy pass, the results are identical to eng_float()
+    needs numpy, which is only imported when this is called
+
+    >>> floats, errors = eng_float_array(['12u6', '4k7', '1meg', '3', '', '14.3mm', '1t'])
+    >>> floats.tolist()[:4]
+    [1.26e-05, 4700.0, 1000000.0, 3.0]
+    >>> errors.tolist()
+    [False, False, False, False, True, True, True]
+    
+    the search order is the same as eng_float(), so the longest multiplier wins
+    >>> eng_float_array(['1Mega', '1da', '1a', '2mega5', '1E3', '12E'])[0].tolist()
+    [1000000.0, 10.0, 1e-18, 2500000.0, 1000.0, 1.2e+19]
+    """
+    floats, status = eng_float_status_array(values)
+    return floats, status!=STATUS_OK
+
+
+
+def _decoded_array(values):
+    """ values as a numpy str array, with any bytes or bytearray decoded as UTF-8
+    numpy would read a bytearray in a list as a list of ints, and decodes bytes as ascii"""
+    import numpy as np
+
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind=='S':
+            return np.char.decode(values, 'utf-8', 'replace')
+    elif isinstance(values, (bytes, bytearray)):
+        values = values.decode('utf-8', 'replace')
+    elif isinstance(values, (list, tuple)):
+        values = [v.decode('utf-8', 'replace') if isinstance(v, (bytes, bytearray)) else v
+                  for v in values]
+    return np.asarray(values, dtype=np.str_)
+
+
+
+def eng_float_status_array(values):
+    """Return (floats, status) for a list or numpy array of strings, never raising ValueError
+
+    floats is as for eng_float_array(), status is a uint8 array of the STATUS_ codes
+    that eng_float_status() would give for each element
+    no error messages are made, eng_float_message() will make them for the ones you want
+
+    >>> floats, status = eng_float_status_array(['4k7', '', '14.3mm', '1.2m3', 'N/A'])
+    >>> status.tolist()
+    [0, 1, 2, 3, 4]
+
+    bytes, bytearrays and numpy bytes arrays are decoded as UTF-8, as eng_float_status() does
+    >>> eng_float_status_array([b'4k7', bytearray(b'2'), b'4\\xc2\\xb5'])[0].tolist()
+    [4700.0, 2.0, 4e-06]
+    >>> import numpy as np
+    >>> eng_float_status_array(np.array([b'4k7', b'4\\xb5']))[1].tolist()
+    [0, 4]
+    """
+    import numpy as np
+
+    s = _decoded_array(values)
+    shape = s.shape
+    s = s.ravel()
+
+    floats = np.full(s.shape, np.nan)
+    status = np.zeros(s.shape, dtype=np.uint8)
+    status[np.char.str_len(s)==0] = STATUS_EMPTY
+
+    # let float() have first go at everything, as eng_float() does
+    todo = np.flatnonzero(status==STATUS_OK)
+    got, ok = _bulk_float(s[todo])
+    floats[todo[ok]] = got[ok]
+    todo = todo[~ok]
+
+    x = np.char.strip(s[todo])
+    unclaimed = np.ones(todo.shape, dtype=bool)
+
+    # suffixes, long to short, each group turned into an exponent in one go
+    for search_in in (longest_weights, long_weights, weights):
+        for suffix, weight in search_in.items():
+            hit = unclaimed & np.char.endswith(x, suffix)
+            if not hit.any():
+                continue
+            unclaimed &= ~hit
+            head = np.char.rpartition(x[hit], suffix)[:, 0]
+            got, ok = _bulk_float(np.char.add(head, 'e'+str(weight)))
+            where = todo[hit]
+            floats[where] = got
+            status[where[~ok]] = STATUS_SUFFIX
+
+    # infixes, searched in the same order as eng_float(), not by position
+    for search_in in (longest_weights, long_weights, weights):
+        for infix, weight in search_in.items():
+            hit = unclaimed & (np.char.find(x, infix) >= 0)
+            if not hit.any():
+                continue
+            unclaimed &= ~hit
+            parts = np.char.partition(x[hit], infix)
+            cand = np.char.add(np.char.add(parts[:, 0], '.'), parts[:, 2])
+            got, ok = _bulk_float(np.char.add(cand, 'e'+str(weight)))
+            where = todo[hit]
+            floats[where] = got
+            status[where[~ok]] = STATUS_INFIX
+
+    # and whatever is left had no multiplier at all
+    status[todo[unclaimed]] = STATUS_NO_MULTIPLIER
+
+    return floats.reshape(shape), status.reshape(shape)
+
+
+
+EngQuantity = collections.namedtuple('EngQuantity', 'value unit')
+
+
+class EngUnitParser:
+    """An eng_float() that reads a unit after the multiplier too, like '4k7Ω' or '100nF'
+
+    units       dict of unit spellings to the symbol returned for them, defaults to the
+                module units dict, which is copied, so later changes to it aren't seen
+
+    the multiplier and the unit are found in one regex, compiled here, once
+    the multipliers are tried longest first, as eng_float() does, and then the units
+    a space is allowed before the multiplier or unit, and a plain exponent like 1e3V too
+
+    >>> p = EngUnitParser()
+    >>> [tuple(p(s)) for s in ('4k7Ω', '100nF', '3.3V', '10m', '10mm', '2.2 uH', '1meg')]
+    [(4700.0, 'Ω'), (1e-07, 'F'), (3.3, 'V'), (0.01, ''), (0.01, 'm'), (2.2e-06, 'H'), (1000000.0, '')]
+
+    each unit symbol has a code, its index in names, 0 being no unit at all
+    >>> EngUnitParser({'V':'V', 'volts':'V', 'A':'A'}).names
+    ('', 'V', 'A')
+    
+    >>> p('10 parsecs')
+    Traceback (most recent call last):
+        ...
+    ValueError: could not parse "10 parsecs" as a value with a unit
+    """
+
+    __slots__ = ('names', '_codes', '_match')
+
+    def __init__(self, units=None):
+        if units is None:
+            units = globals()['units']
+        self.names = ('',) + tuple(dict.fromkeys(units.values()))
+        self._codes = {key: self.names.index(name) for key, name in units.items()}
+        spellings = sorted(units, key=len, reverse=True)
+        pattern = (r'([+-]?)(?:({d})?({k})({d})'                             # 4k7, k7
+                   r'|({d})?(?:\.({d})?)?([eE][+-]?{d})?(?:\s*({k}))?'       # 4.7, 4.7k, 4.7e3
+                   r')(?:\s*({u}))?')
+        pattern = pattern.format(d=_DIGITS, k=_alternation(_eng_weights), u=_alternation(spellings))
+        self._match = re.compile(pattern).fullmatch
+
+    def _parsed(self, x):
+        """ return (value, unit code) for the stripped string x, or None"""
+        m = self._match(x)
+        if m is None:
+            return None
+        sign, first, infix, last, whole, frac, exponent, suffix, unit = m.groups()
+        if infix is not None:
+            if infix=='E' and first:       # 1E3 is a plain float
+                value = float(sign+first+'e'+last)
+            else:
+                value = _scaled(sign, first, last, _eng_weights[infix])
+        elif not (whole or frac):
+            return None
+        elif exponent is not None:
+            if suffix is not None:          # 1e3k, two exponents
+                return None
+            value = float(x[:m.end(7)])
+        else:
+            value = _scaled(sign, whole, frac, _eng_weights[suffix] if suffix else 0)
+        return value, self._codes[unit] if unit else 0
+
+    def __call__(self, x_org):
+        """ return an EngQuantity(value, unit), raising ValueError if x_org won't parse"""
+        if len(x_org)==0:
+            raise ValueError('no input, nothing to do')
+        got = self._parsed(x_org.strip())
+        if got is None:
+            raise ValueError('could not parse "{}" as a value with a unit'.format(x_org))
+        return EngQuantity(got[0], self.names[got[1]])
+
+    def parse_many(self, strings):
+        """Return (values, codes) for an iterable of strings, as parallel arrays
+
+        values is an array('d'), codes an array('h') of indices into names
+        strings that won't parse get nan, and a code of -1, rather than raising
+
+        >>> values, codes = EngUnitParser().parse_many(['4k7R', '100nF', 'N/A', '12'])
+        >>> list(values)[:2], list(codes)
+        ([4700.0, 1e-07], [8, 5, -1, 0])
+        """
+        values = array.array('d')
+        codes = array.array('h')
+        parsed = self._parsed
+        for x in strings:
+            got = parsed(x.strip())
+            if got is None:
+                values.append(math.nan)
+                codes.append(-1)
+            else:
+                values.append(got[0])
+                codes.append(got[1])
+        return values, codes
+
+_unit_parser = EngUnitParser()
+
+
+
+def eng_float_unit(x_org):
+    """Return EngQuantity(value, unit) for a string like '4k7Ω', '100nF' or '3.3V'
+
+    the unit is the symbol from the module units dict, or '' if there isn't one
+    use an EngUnitParser for a table of your own
+
+    >>> eng_float_unit('-12.5mA')
+    EngQuantity(value=-0.0125, unit='A')
+    """
+    return _unit_parser(x_org)
+
+
+
+def eng_float_units(strings):
+    """Return (values, codes) for an iterable of strings, as EngUnitParser.parse_many()
+
+    the unit codes index eng_unit_names, where code 0 is no unit, and -1 means not parsed
+
+    >>> values, codes = eng_float_units(['3u3F', '470k', 'junk'])
+    >>> [eng_unit_names[c] if c>=0 else None for c in codes]
+    ['F', '', None]
+    """
+    return _unit_parser.parse_many(strings)
+
+eng_unit_names = _unit_parser.names
+
+
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses evictions maxsize currsize')
+
+
+class EngCache:
+    """A bounded memo of eng_float() and eng_str() results, least recently used goes first
+
+    it's opt-in, make one and call its eng_float() and eng_str() in place of the module ones
+    the eng_str() key includes every formatting option, so different options never collide
+    strings that eng_float() can't parse are remembered too, and raise the same ValueError
+
+    all the bookkeeping is done under a lock, so one cache can be shared between threads
+    the conversion itself is done outside the lock, so two threads may occasionally
+    both convert the same new value, and one of the results is kept
+
+    >>> cache = EngCache(maxsize=2)
+    >>> [cache.eng_float(s) for s in ('10k', '10k', '4u7', '1M')]
+    [10000.0, 10000.0, 4.7e-06, 1000000.0]
+    >>> cache.info()
+    CacheInfo(hits=1, misses=3, evictions=1, maxsize=2, currsize=2)
+
+    >>> [cache.eng_str(4.7e-6), cache.eng_str(4.7e-6, micro=MICRO_SIGN)]
+    ['4.7u', '4.7µ']
+    >>> cache.clear()
+    >>> cache.info()
+    CacheInfo(hits=0, misses=0, evictions=0, maxsize=2, currsize=0)
+    """
+
+    def __init__(self, maxsize=4096):
+        if maxsize<0:
+            raise ValueError('maxsize must not be negative, got {}'.format(maxsize))
+        self.maxsize = maxsize
+        self._store = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def _lookup(self, key, func, *args):
+        with self._lock:
+            try:
+                result = self._store[key]
+            except KeyError:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._store.move_to_end(key)
+                if isinstance(result, ValueError):
+                    raise ValueError(*result.args)
+                return result
+
+        try:
+            result = func(*args)
+        except ValueError as err:
+            result = ValueError(*err.args)     # without the traceback, which we don't want to keep
+
+        with self._lock:
+            if self.maxsize:
+                self._store[key] = result
+                self._store.move_to_end(key)
+                while len(self._store)>self.maxsize:
+                    self._store.popitem(last=False)
+                    self._evictions += 1
+
+        if isinstance(result, ValueError):
+            raise ValueError(*result.args)
+        return result
+
+    def eng_float(self, x):
+        """ eng_float(x), remembered"""
+        return self._lookup(x, eng_float, x)
+
+    def eng_str(self, x, digits=6, limits=(-12,9), micro='u', mega='M',
+                infix=False, show_plus=False, show_trailing_zeros=False):
+        """ eng_str(x, ...), remembered for each combination of x and options"""
+        if not x:    # 0.0 == -0.0, but they don't format the same
+            return eng_str(x, digits, limits, micro, mega, infix, show_plus, show_trailing_zeros)
+        key = (type(x), x, digits, tuple(limits), micro, mega, infix, show_plus, show_trailing_zeros)
+        return self._lookup(key, eng_str, x, digits, limits, micro, mega,
+                            infix, show_plus, show_trailing_zeros)
+
+    def info(self):
+        """ return the hits, misses, evictions, maxsize and current size"""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._store))
+
+    def clear(self):
+        """ empty the cache and zero the statistics"""
+        with self._lock:
+            self._store.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+
+ParseError = collections.namedtuple('ParseError', 'line column text message')
+ConvertedBatch = collections.namedtuple('ConvertedBatch', 'rows errors')
+
+
+def eng_float_rows(source, columns, delimiter=',', header=False, batch_size=10000,
+                   convert=None, bad_value=math.nan):
+    """Stream a delimited file, converting the chosen columns with eng_float()
+
+    source      a file name, or anything that yields lines, like an open file
+    columns     the column numbers to convert, or their names if header is True
+    delimiter   ',' for csv, '\\t' for tsv
+    header      defaults to False, if True the first row holds the column names, and is skipped
+    batch_size  the number of rows in each batch yielded
+    convert     defaults to eng_float, an EngCache's eng_float is a good alternative
+    bad_value   what to put in cells that won't convert, defaults to nan
+
+    yield ConvertedBatch(rows, errors) tuples, rows is a list of lists, with the chosen
+    columns converted to float and the rest left as strings, errors is a list of
+    ParseError(line, column, text, message) for the cells that didn't convert
+    only one batch is held at a time, so memory use doesn't grow with the file
+
+    >>> import io
+    >>> data = io.StringIO('R,C\\n4k7,100n\\n10k,N/A\\n')
+    >>> for batch in eng_float_rows(data, ['R', 'C'], header=True):
+    ...     print(batch.rows)
+    ...     print(batch.errors)
+    [[4700.0, 1e-07], [10000.0, nan]]
+    [ParseError(line=3, column=1, text='N/A', message='could not parse "N/A" as float, no multiplier found')]
+    """
+    with _open_rows(source) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        indices = _column_indices(reader, columns, header)
+        yield from _converted_batches(reader, indices, batch_size, convert or eng_float, bad_value)
+
+
+
+def eng_float_file(source, dest, columns, delimiter=',', header=False, batch_size=10000,
+                   convert=None, bad_value=math.nan, on_error=None):
+    """Convert the chosen columns of a delimited file with eng_float(), writing a new file
+
+    the parameters are those of eng_float_rows(), with
+    dest        a file name, or an open file to write to, in the same format
+    on_error    called with each ParseError as it happens, if given
+
+    the header row, if any, is copied across unchanged
+    return (rows, errors), the number of rows written and cells that failed
+    """
+    n_rows = n_errors = 0
+    with _open_rows(source) as f, _open_rows(dest, 'w') as g:
+        reader = csv.reader(f, delimiter=delimiter)
+        writer = csv.writer(g, delimiter=delimiter)
+        if header:
+            names = next(reader, [])
+            writer.writerow(names)
+            indices = _column_indices(iter([names]), columns, True)
+        else:
+            indices = _column_indices(reader, columns, False)
+        for batch in _converted_batches(reader, indices, batch_size, convert or eng_float, bad_value):
+            writer.writerows(batch.rows)
+            n_rows += len(batch.rows)
+            n_errors += len(batch.errors)
+            if on_error:
+                for error in batch.errors:
+                    on_error(error)
+    return n_rows, n_errors
+
+
+
+def _open_rows(source, mode='r'):
+    """ open a file name for csv, or wrap an open file so that with doesn't close it"""
+    if isinstance(source, (str, bytes, os.PathLike)):
+        return open(source, mode, newline='')
+    return contextlib.nullcontext(source)
+
+
+
+def _column_indices(reader, columns, header):
+    """ return the list of column numbers, reading the names from the header if needed"""
+    if not header:
+        return [int(c) for c in columns]
+    names = next(reader, [])
+    try:
+        return [c if isinstance(c, int) else names.index(c) for c in columns]
+    except ValueError:
+        missing = [c for c in columns if not isinstance(c, int) and c not in names]
+        raise ValueError('columns {} not found in header {}'.format(missing, names)) from None
+
+
+
+def _converted_batches(reader, indices, batch_size, convert, bad_value):
+    """ yield ConvertedBatch tuples of batch_size rows from the csv reader"""
+    rows = []
+    errors = []
+    for row in reader:
+        for i in indices:
+            try:
+                row[i] = convert(row[i])
+            except ValueError as err:
+                errors.append(ParseError(reader.line_num, i, row[i], str(err)))
+                row[i] = bad_value
+            except IndexError:
+                errors.append(ParseError(reader.line_num, i, None, 'row has no column {}'.format(i)))
+        rows.append(row)
+        if len(rows)>=batch_size:
+            yield ConvertedBatch(rows, errors)
+            rows = []
+            errors = []
+    if rows or errors:
+        yield ConvertedBatch(rows, errors)
+
+
+
+def eng_scan(buffer):
+    """Find every number in a bytes-like buffer, returning (offsets, values)
+
+    buffer can be bytes, bytearray, memoryview or an mmap of a file, it's never decoded
+    a number is anything eng_float() would take, multipliers as suffix or infix,
+    or a plain float, with nothing but punctuation or spaces on either side of it
+    the micro signs are recognised in their UTF-8 encoding
+
+    offsets is an array('q') of where each number starts, values an array('d') of the numbers
+
+    >>> offsets, values = eng_scan(b'V1=3u3 R2=4k7 f=1.2meg t=12.5 gain=2.5E2 I=12mA')
+    >>> list(offsets), list(values)
+    ([3, 10, 16, 25, 35], [3.3e-06, 4700.0, 1200000.0, 12.5, 250.0])
+
+    >>> list(eng_scan(b'1.2E-3 -4.5E+06 7E3 1.0E-09 2E')[1])
+    [0.0012, -4500000.0, 7000.0, 1e-09, 2e+18]
+    """
+    offsets = array.array('q')
+    values = array.array('d')
+    for m in _scan_finditer(buffer):
+        sign, first, infix, last, whole, frac, point_frac, suffix = m.groups()
+        sign = '-' if sign==b'-' else ''
+        if infix is not None and (infix!=b'E' or first is None):
+            value = _scaled(sign, first, last, _scan_weights[infix], b'_')
+        elif suffix is not None:
+            value = _scaled(sign, whole, frac or point_frac, _scan_weights[suffix], b'_')
+        else:    # plain numbers, and 1E3
+            value = float(m.group())
+        offsets.append(m.start())
+        values.append(value)
+    return offsets, values
+
+
+
+def eng_scan_file(filename):
+    """ eng_scan() the whole of a file, through mmap, so it's never read into memory"""
+    with open(filename, 'rb') as f:
+        if os.fstat(f.fileno()).st_size==0:     # mmap can't map an empty file
+            return array.array('q'), array.array('d')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return eng_scan(buffer)
+
+
+
+def _compile_scanner(keys):
+    """ return the finditer function and weights for eng_scan(), from the eng_float() keys"""
+    encoded = {key.encode('utf-8'): weight for key, weight in keys.items()}
+    # multibyte keys are spelt out, single bytes go in a class, longest first as before
+    alternatives = [re.escape(key) for key in encoded if len(key)>1]
+    alternatives.append(b'[' + b''.join(re.escape(key) for key in encoded if len(key)==1) + b']')
+    # an exponent is tried before a multiplier, or the E of 1.2E-3 would be taken for Exa
+    digits = rb'\d(?:_?\d)*'
+    pattern = (rb'(?<![\w.])([+-]?)(?:({d})?({k})({d})'             # 1k3, k3
+               rb'|(?:({d})(?:\.({d})?)?|\.({d}))(?:[eE][+-]?{d}|({k}))?'    # 1.3e3, 1.3k, .3
+               rb')(?!\w)')
+    pattern = pattern.replace(b'{d}', digits).replace(b'{k}', b'|'.join(alternatives))
+    return re.compile(pattern).finditer, encoded
+
+_scan_finditer, _scan_weights = _compile_scanner(_eng_weights)
+
+
+
+def eng_float_many(strings, workers=None, chunksize=100000, bad_value=None):
+    """Convert a big iterable of strings with eng_float(), over a pool of processes
+
+    workers     the number of processes, defaults to the number of cpus
+    chunksize   how many strings each process is given at a time
+    bad_value   defaults to None, which raises ValueError for the first string that
+                won't convert, otherwise what to put in its place, nan is usual
+
+    return an array('d'), in the same order as the input
+    each chunk comes back from its process as the raw bytes of an array('d'),
+    and only a few chunks are in flight at once, so the input can be a generator
+    anything that fits into a single chunk is done here, as the pool isn't worth starting
+
+    >>> list(eng_float_many(['4k7', '1meg', 'junk', '12u6'], bad_value=math.nan))
+    [4700.0, 1000000.0, nan, 1.26e-05]
+    >>> list(eng_float_many(['4k7', '1meg', 'junk', '12u6', '3'], workers=2, chunksize=2, bad_value=-1))
+    [4700.0, 1000000.0, -1.0, 1.26e-05, 3.0]
+    """
+    out = array.array('d')
+    chunks = _chunked(strings, chunksize)
+    for chunk in _map_chunks(_eng_float_chunk, chunks, workers, (bad_value,)):
+        out.frombytes(chunk)
+    return out
+
+
+
+def eng_str_many(values, workers=None, chunksize=100000, **options):
+    """Format a big iterable of numbers with eng_str(), over a pool of processes
+
+    the options are those of eng_str(), workers and chunksize as for eng_float_many()
+    the values are sent to the processes as an array('d'), so they are formatted as floats
+
+    return a list of strings, in the same order as the input
+
+    >>> eng_str_many([3, 1.2e3, 30e3, -0.007], workers=2, chunksize=2, micro=MICRO_SIGN)
+    ['3', '1.2k', '30k', '-7m']
+    """
+    formatter = EngFormatter(**options)
+    out = []
+    chunks = _chunked(values, chunksize, lambda items: array.array('d', items).tobytes())
+    for chunk in _map_chunks(_eng_str_chunk, chunks, workers, (formatter,)):
+        out.extend(chunk.split('\0'))
+    return out
+
+
+
+def _eng_float_chunk(strings, bad_value):
+    """ convert one chunk for eng_float_many(), returning the bytes of an array('d')"""
+    out = array.array('d')
+    for s in strings:
+        try:
+            out.append(eng_float(s))
+        except ValueError:
+            if bad_value is None:
+                raise
+            out.append(bad_value)
+    return out.tobytes()
+
+
+
+def _eng_str_chunk(values, formatter):
+    """ format one chunk for eng_str_many(), the bytes of an array('d') in, one string out"""
+    floats = array.array('d')
+    floats.frombytes(values)
+    return '\0'.join(map(formatter, floats))
+
+
+
+def _chunked(iterable, chunksize, make_chunk=list):
+    """ yield make_chunk(items) for successive lists of chunksize items from the iterable"""
+    iterator = iter(iterable)
+    while True:
+        items = list(itertools.islice(iterator, chunksize))
+        if not items:
+            return
+        yield make_chunk(items)
+
+
+
+def _map_chunks(func, chunks, workers, args):
+    """ yield func(chunk, *args) for each of the chunks, in order
+
+    the chunks are farmed out to a process pool, keeping two per worker in flight
+    a single chunk, or a single worker, is done in this process"""
+    workers = workers or os.cpu_count() or 1
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if second is None or workers==1:
+        for chunk in itertools.chain((first,), () if second is None else (second,), chunks):
+            yield func(chunk, *args)
+        return
+
+    import concurrent.futures      # a slow import, so only when there's a pool to start
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for chunk in itertools.chain((first, second), chunks):
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending)>=2*workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+
+Reading = collections.namedtuple('Reading', 'name value')
+
+
+async def eng_read_stream(reader, batch_size=100, max_delay=0.05, separator='=',
+                          convert=None, bad_value=math.nan, encoding='utf-8'):
+    """Decode lines like 'V1=3u3' from an asyncio StreamReader, yielding batches of readings
+
+    reader      an asyncio.StreamReader, like the first thing asyncio.open_connection() returns
+    batch_size  the most readings in each batch yielded
+    max_delay   seconds to wait for more lines before yielding a batch that isn't full
+    separator   between the name and the value, a line without one is all value, with name ''
+    convert     defaults to eng_float, an EngCache's eng_float is a good alternative
+    bad_value   what to put in readings that won't convert, defaults to nan
+
+    an async generator of ConvertedBatch(rows, errors), rows is a list of Reading(name, value),
+    errors a list of ParseError(line, column, text, message), column being 1, the value
+    blank lines are skipped, but still counted
+    nothing more is read until the batch before has been taken, so a slow consumer
+    leaves lines in the socket, and TCP tells the instrument to slow down
+
+    >>> import asyncio
+    >>> async def loopback():
+    ...     async def serve(reader, writer):
+    ...         await eng_write_stream(writer, [('V1', 3.3e-6), ('R2', 4700.0)])
+    ...         writer.write(b'T=N/A\\n')
+    ...         writer.close()
+    ...     server = await asyncio.start_server(serve, '127.0.0.1', 0)
+    ...     reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+    ...     batches = [batch async for batch in eng_read_stream(reader)]
+    ...     writer.close()
+    ...     server.close()
+    ...     return batches
+    >>> for batch in asyncio.run(loopback()):
+    ...     print(batch.rows)
+    ...     print(batch.errors)
+    [Reading(name='V1', value=3.3e-06), Reading(name='R2', value=4700.0), Reading(name='T', value=nan)]
+    [ParseError(line=3, column=1, text='N/A', message='could not parse "N/A" as float, no multiplier found')]
+    """
+    import asyncio
+
+    convert = convert or eng_float
+    loop = asyncio.get_running_loop()
+    line_num = 0
+    rows = []
+    errors = []
+    deadline = None
+    while True:
+        try:
+            if deadline is None:
+                raw = await reader.readline()
+            else:
+                # a cancelled readline leaves the partial line in the reader, for next time
+                raw = await asyncio.wait_for(reader.readline(), max(deadline-loop.time(), 0))
+        except asyncio.TimeoutError:
+            yield ConvertedBatch(rows, errors)
+            rows = []
+            errors = []
+            deadline = None
+            continue
+        if not raw:
+            break
+        line_num += 1
+        line = raw.decode(encoding, 'replace').strip()
+        if not line:
+            continue
+        name, sep, text = line.partition(separator)
+        if not sep:
+            name, text = '', line
+        name = name.strip()
+        text = text.strip()
+        try:
+            value = convert(text)
+        except ValueError as err:
+            errors.append(ParseError(line_num, 1, text, str(err)))
+            value = bad_value
+        rows.append(Reading(name, value))
+        if len(rows)>=batch_size:
+            yield ConvertedBatch(rows, errors)
+            rows = []
+            errors = []
+            deadline = None
+        elif deadline is None:
+            deadline = loop.time()+max_delay
+    if rows or errors:
+        yield ConvertedBatch(rows, errors)
+
+
+
+async def eng_write_stream(writer, readings, batch_size=100, separator='=',
+                           encoding='utf-8', **options):
+    """Write (name, value) readings to an asyncio StreamWriter as lines like 'V1=3u3'
+
+    readings    an iterable, or an async iterable, of (name, value) pairs, Readings will do
+    batch_size  how many lines are written between waits for the writer to drain
+    the options are those of eng_str(), made into one EngFormatter for the whole stream
+
+    return the number of lines written
+    the writer isn't closed, so more can be sent after
+    """
+    formatter = EngFormatter(**options)
+    if not hasattr(readings, '__aiter__'):
+        readings = _as_async(readings)
+    lines = []
+    count = 0
+    async for name, value in readings:
+        lines.append('{}{}{}\n'.format(name, separator, formatter(value)))
+        if len(lines)>=batch_size:
+            writer.write(''.join(lines).encode(encoding))
+            count += len(lines)
+            lines = []
+            await writer.drain()
+    if lines:
+        writer.write(''.join(lines).encode(encoding))
+        count += len(lines)
+    await writer.drain()
+    return count
+
+
+
+async def _as_async(iterable):
+    """ an async iterator over an ordinary iterable"""
+    for item in iterable:
+        yield item
+
+
+
+
+
 if __name__ == '__main__':
     import doctest
     print('running doctest')
@@ -0,0 +1,88 @@
+""" convenience functions for validating data inputs, with no GUI imports
+
+each takes a string, and returns the converted value, or raises ValueError
+so they can be used as the conv of a gui_io_widget entry, or anywhere else
+float_pair()
+list_of_floats()
+yesno()
+"""
+
+"""
+Copyright (c) <2016>, <Neil Thomas>, <NeilT-UK>, <dc_fm@hotmail.com>
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+   list of conditions and the following disclaimer. 
+2. Redistributions in binary form must reproduce the above copyright notice,
+   this list of conditions and the following disclaimer in the documentation
+   and/or other materials provided with the distribution.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+The views and conclusions contained in the software and documentation are those
+of the authors and should not be interpreted as representing official policies, 
+either expressed or implied, of the FreeBSD Project.
+"""
+
+def float_pair(x):
+    """[f,f] Two floats seperated by a comma
+    [end_help]
+
+    example non-trivial conversion function
+    not all of docstring intended to be displayed as help
+    throw ValueError from two locations, one from split, one from float
+    return a list of the values
+    """
+    fields = x.split(',')
+    if len(fields) != 2:
+        raise ValueError('need two fields seperated by one comma')
+    output = []
+    for field in fields:        # float() will ValueError if it's wrong 
+        output.append(float(field))
+    return output
+
+def list_of_floats(x):
+    """[lof] list of floats
+    One float, or several floats separated by commas"""
+
+    # try to eliminate the simplest problem
+    if ',' in x:
+        if x.rstrip()[-1] == ',':
+            raise ValueError('no final value')
+
+    out = []
+    fields = x.split(',')          # this will always work without error
+    for field in fields:
+        out.append(float(field))   # and float() will ValueError if it 
+    return out                     # doesn't understand the string
+
+def yesno(x):
+    """[yesno] all or sufficient part of any of the words true, false, yes, no, 0, 1, OK"""
+    if len(x)==0:
+        raise ValueError('no answer')
+
+    is_true = False
+    is_false = False
+    
+    for c in x.lower():
+        if c in 'truy1k':  # spots TRUe, Yes 1, oK
+            is_true = True
+        if c in 'faln0':   # spots FALse, No, 0
+            is_false = True
+    # e, s, o are ambiguous
+
+    if is_true == is_false:
+        raise ValueError('ambiguous answer')
+    return is_true
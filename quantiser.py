@@ -1,11 +1,17 @@
 """ export qXXX quantiser functions, and general make_quant function
 
-use function closures to return the following pre-defined qXXX functions
-qE3 to qE192, the standard resistor ranges
+make_quant() returns a Quantiser, and these are pre-defined
+qE3 to qE192, the standard resistor ranges, series('E24') gives them by name, with their tolerance
 qE2  [1, 3, 10]
 qE5  [1, 1.6, 2.5, 4, 6.3, 10]
 qE10 [1, 1.25, 1.6, 2, 2.5, 3.2, 4, 5, 6.3, 8, 10]
 
+ratios() finds two values that make a ratio, or a divider, within a window of total resistance
+Quantiser.value() returns a QValue, a quantised value held exactly as steps up the basis
+Quantiser.between(low, high) walks every value from low to high, between_array() returns them all
+BestFit takes the first of several series to get within a tolerance, in one lookup
+ticks() makes nice axis ranges, 1, 2, 5 ticks and their labels, for many axes at once
+
 return a function that quantises according to the tuple basis
 make_quant(basis)"""
 
@@ -38,21 +44,26 @@ of the authors and should not be interpreted as representing official policies,
 either expressed or implied, of the FreeBSD Project.
 """
 
-# there are several different ways this function may be approached
-# this uses closures (because I could, and wanted to try it)
-# alternatively I could make a class with a __call__ method
-# or simply create functions manually that do it
-# not sure which is the best
+# make_quant() used to return a closure (because I could, and wanted to try it)
+# it now returns a Quantiser, a class with a __call__ method, so that the basis
+# can be checked, and everything that doesn't depend on x worked out, just once
 
-version = '1.0     December 2016'
+version = '1.1     October 2026'
 
+import array
+import collections
+import functools
 import math
+import sys
+from bisect import bisect_left, bisect_right
+from math import floor, log
 
 def make_quant(basis):
     """ return the quant function, preconfigured with the basis
 
     basis starts with a 1, is monotonically increasing,
     it defines a geometrically extendable range with a ratio of the last/first numbers    
+    raise ValueError if it doesn't
     
     >>> qE12(1.6)
     1.5
@@ -69,73 +80,562 @@ def make_quant(basis):
     >>> '{:.4f}'.format(qE12(0.17))
     '0.1800'
 
+    lists and numpy arrays are quantised in one go, zeros stay zero and signs are kept
+    >>> qE12([1.6, -17, 0, 0.17]).tolist()
+    [1.5, -18.0, 0.0, 0.18000000000000002]
+
+    >>> qE12([1.6, 8.3], offset=4).tolist()
+    [3.3, 18.0]
+
+    >>> make_quant([1, 3, 2, 10])
+    Traceback (most recent call last):
+        ...
+    ValueError: basis must increase, but 2 follows 3
+
+    """
+    return Quantiser(basis)
+
+
 
+# scaling x into the basis range can leave an exact basis value a few ulps off, 3300*0.001
+# is 3.3000000000000003, so floor and ceil take anything that close as the basis value itself
+_SNAP_UP = 1+16*sys.float_info.epsilon
+_SNAP_DOWN = 1-16*sys.float_info.epsilon
+
+
+class Quantiser:
+    """The function that make_quant() returns, quantising to a geometrically repeating basis
+
+    the basis is checked, and the geometric midpoints between neighbouring values and
+    a table of the powers of the range are worked out once, here, so each call is a log,
+    a multiply and a bisect, and nothing is written after __init__
+
+    name and tolerance are for the standard series, see series(), and None otherwise
     """
-    def quant(x, nearest=0, offset=0):
+
+    __slots__ = ('basis', 'name', 'tolerance', '_base1', '_steps', '_log_base1', '_mids', '_lo', '_powers',
+                 '_mantissas', '_places')
+
+    def __init__(self, basis, name=None, tolerance=None):
+        basis = tuple(float(b) for b in basis)
+        if len(basis)<2:
+            raise ValueError('basis needs at least two values, got {}'.format(len(basis)))
+        if basis[0]!=1:
+            raise ValueError('basis must start with 1, got {}'.format(basis[0]))
+        for low, high in zip(basis, basis[1:]):
+            if not high>low:
+                raise ValueError('basis must increase, but {:g} follows {:g}'.format(high, low))
+        if not math.isfinite(basis[-1]):
+            raise ValueError('basis must be finite')
+
+        self.basis = basis
+        self.name = name
+        self.tolerance = tolerance
+        self._base1 = basis[-1]
+        self._steps = len(basis)-1
+        self._log_base1 = math.log(basis[-1])
+        # nearer the upper value from the geometric midpoint up, as the ratio test always was
+        self._mids = tuple(math.sqrt(low*high) for low, high in zip(basis, basis[1:]))
+
+        # base1**e for every e that a finite float can need, from below the smallest
+        # subnormal, where they are 0.0, up to the largest power that doesn't overflow
+        hi = math.floor(math.log(sys.float_info.max)/self._log_base1)
+        while True:
+            try:
+                self._base1**hi
+                break
+            except OverflowError:
+                hi -= 1
+        self._lo = math.floor(math.log(5e-324)/self._log_base1)-2
+        self._powers = tuple(self._base1**e for e in range(self._lo, hi+1))
+
+        # a range of 10 with a basis of few decimal places is held as integer mantissas too,
+        # for QValue, so that a value comes out as one division by an exact power of ten
+        self._mantissas = None
+        self._places = 0
+        if self._base1==10:
+            for places in range(7):
+                mantissas = tuple(round(b*10**places) for b in basis)
+                if all(m/10**places==b for m, b in zip(mantissas, basis)):
+                    self._mantissas = mantissas
+                    self._places = places
+                    break
+
+    def __repr__(self):
+        if self.name in _SERIES:
+            return 'series({!r})'.format(self.name)
+        return 'make_quant({!r})'.format(list(self.basis))
+
+    def split(self, x):
+        """ return (exp, scaled) for x>0, where x = scaled*base1**exp and 1 <= scaled < base1
+
+        exp is the range that x falls in, as the quantiser finds it"""
+        if not x>=1e-100:
+            raise ValueError('can only split values from 1e-100 up, got {!r}'.format(x))
+        exp = floor(log(x)/self._log_base1)
+        return self._settle(x, exp, x*self._powers[-exp-self._lo])
+
+    def _power(self, e):
+        """ base1**e from the table, or 0.0 or inf beyond it"""
+        k = e-self._lo
+        if k<0:
+            return 0.0
+        if k>=len(self._powers):
+            return math.inf
+        return self._powers[k]
+
+    def nearest(self, x, offset=0):
+        """ the geometrically nearest value to x, or offset steps from it"""
+        return self(x, 0, offset)
+
+    def floor(self, x, offset=0):
+        """ the largest value at or below x, or offset steps from it"""
+        return self(x, -1, offset)
+
+    def ceil(self, x, offset=0):
+        """ the smallest value at or above x, or offset steps from it
+
+        a value of the series is its own floor and ceil, though scaling it leaves it an ulp or two off
+
+        >>> qE12.ceil(12)==12, qE12.ceil(3300), qE12.floor(2.2e-12)==qE12.ceil(2.2e-12)
+        (True, 3300.0, True)
+        >>> qE12.ceil([12.0, 3300.0]).tolist(), qE12.floor([12.0, 3300.0]).tolist()
+        ([12.0, 3300.0], [12.0, 3300.0])
+        """
+        return self(x, 1, offset)
+
+    def __call__(self, x, nearest=0, offset=0):
         """ Quantise x
 
         nearest = 0 (default) return the geometrically nearest number
         nearest = -1          return the lower number (floor)
         nearest = 1           return the higher number (ceil)
         offset = 0 (default)  return the number as is
-        offset = n            return the nth higher or lower quantisation step"""
+        offset = n            return the nth higher or lower quantisation step
+
+        x can also be a list or numpy array, when a numpy array of the results is returned"""
+
+        kind = type(x)
+        if kind is not float and kind is not int:
+            if isinstance(x, (list, tuple)) or getattr(x, 'ndim', 0):
+                return self.quantise_array(x, nearest, offset)
 
-        # sanitise the input args (slightly, should I float() it?)
         x_test = abs(x)
         if x_test<1e-100:  # or whatever small test number
-            return 0
+            return 0.0
+
+        # bring our test number into the basis range, exp is the range power required
+        powers = self._powers
+        lo = self._lo
+        exp = floor(log(x_test)/self._log_base1)
+        scaled = x_test*powers[-exp-lo]
+        if scaled>=self._base1 or scaled<1.000001:
+            exp, scaled = self._settle(x_test, exp, scaled)
+
+        if nearest==0:     # find nearest number, geometrically
+            index = bisect_right(self._mids, scaled)
+        elif nearest>0:    # the smallest basis value at or above
+            index = bisect_left(self.basis, scaled*_SNAP_DOWN)
+        else:              # the largest at or below, -1 is the top of the range below
+            index = bisect_right(self.basis, scaled*_SNAP_UP)-1
+
+        # stepping past either end of the basis wraps into the next range
+        if 0<=index+offset<self._steps:
+            index += offset
+        else:
+            carry, index = divmod(index+offset, self._steps)
+            exp += carry
+        k = exp-lo
+        if 0<=k<len(powers):
+            value = self.basis[index]*powers[k]
+        else:      # beyond the table
+            value = self.basis[index]*(0.0 if k<0 else math.inf)
         if x<0:
-            sign = -1
+            return -value
+        return value
+
+    def _settle(self, x_test, exp, scaled):
+        """ return (exp, x_test*base1**-exp), for the smallest exp that brings x_test below base1
+
+        the log can be out by one at the edge of a range, so exp is settled from the
+        scaled values themselves, which quantise_array() does in exactly the same way"""
+        powers = self._powers
+        lo = self._lo
+        base1 = self._base1
+        while scaled>=base1:
+            exp += 1
+            scaled = x_test*powers[-exp-lo]
+        # a lower exp can only do if x_test is near the bottom of the range
+        while scaled<1.000001:
+            lower = x_test*powers[1-exp-lo]
+            if lower>=base1:
+                break
+            exp -= 1
+            scaled = lower
+        return exp, scaled
+
+    def quantise_array(self, x, nearest=0, offset=0):
+        """ return a numpy array quantising every element of x, identical to calling for each
+
+        raise ValueError if any element is inf or nan"""
+        import numpy as np
+
+        x, live, exp, index = self._locate_array(x, nearest, offset)
+        powers = np.array(self._powers)
+        k = np.where(live, exp, 0)-self._lo
+        # past the ends of the table, 0.0 below, inf above, as for a single value
+        power = np.where(k<0, 0.0, powers[np.clip(k, 0, len(powers)-1)])
+        power = np.where(k>=len(powers), np.inf, power)
+        value = np.asarray(self.basis)[index]*power
+        return np.where(live, np.where(x<0, -value, value), 0.0)
+
+    def _locate_array(self, x, nearest, offset):
+        """ return (x, live, exp, index) for quantise_array() and keys(), live being False
+        for the elements that quantise to zero, and exp and index allowing for offset"""
+        import numpy as np
+
+        x, live, exp, scaled = self._split_array(x)
+        if nearest==0:
+            index = np.searchsorted(self._mids, scaled, side='right')
+        elif nearest>0:
+            index = np.searchsorted(self.basis, scaled*_SNAP_DOWN, side='left')
         else:
-            sign = 1
+            index = np.searchsorted(self.basis, scaled*_SNAP_UP, side='right')-1
 
-        # get the basis range 
-        base0 = basis[0]
-        base1 = basis[-1]
-        lbm1 = len(basis)-1
+        carry, index = np.divmod(index+offset, self._steps)
+        return x, live, exp+carry, index
 
-        # bring our test number into the basis range, exp is the range power required
-        exp = math.floor(math.log(x_test)/math.log(base1))
-        x_test *= base1**(-exp)
-
-        # binary search for the upper and lower bounds around ranged x
-        ilow = 0
-        ihigh = lbm1
-        while ihigh-ilow > 1:
-            imid = int((ilow+ihigh)/2)
-            if x_test> basis[imid]:
-                ilow = imid
-            else:
-                ihigh = imid
-
-        # do we want to use the lower or upper bound?
-        s = int(nearest)
-        if s==0:   # find nearest number, geometrically
-            highrat = basis[ihigh]/x_test
-            lowrat = x_test/basis[ilow]
-            if lowrat<highrat:
-                index = ilow
-            else:
-                index = ihigh
+    def _split_array(self, x):
+        """ return (x, live, exp, scaled), split() for every element of x that isn't near zero,
+        live being False for those that are, which get exp 0 and scaled 1.0"""
+        import numpy as np
 
-        elif s>0: # we want the upper
-            index = ihigh
+        x = np.asarray(x, dtype=np.float64)
+        if not np.isfinite(x).all():
+            raise ValueError('cannot quantise inf or nan')
+        base1 = self._base1
+        powers = np.array(self._powers)
+        lo = self._lo
 
-        else:  # the lower
-            index = ilow
+        x_abs = np.abs(x)
+        live = x_abs>=1e-100     # the rest are zero, as they are for a single value
+        x_test = np.where(live, x_abs, 1.0)
 
-        index += offset
-        while index<0:     # handle the potential wrapping into the previous range
-            index += lbm1
-            exp -= 1 
-        while index>=lbm1:  # handle the potential wrapping into the next range
-            index -= lbm1
-            exp += 1
-            
-        return(sign*basis[index]*(base1**exp))
+        # log10 gets the range power right, or within one, then settle it as _settle() does
+        exp = np.floor(np.log10(x_test)/math.log10(base1)).astype(np.int64)
+        scaled = x_test*powers[-exp-lo]
+        high = scaled>=base1
+        while high.any():
+            exp += high
+            scaled = np.where(high, x_test*powers[-exp-lo], scaled)
+            high = scaled>=base1
+        low = scaled<1.000001
+        while low.any():
+            lower = x_test*powers[np.where(low, 1-exp-lo, -exp-lo)]
+            low &= lower<base1
+            exp -= low
+            scaled = np.where(low, lower, scaled)
+            low &= scaled<1.000001
+        return x, live, exp, scaled
+
+    # the exact values, the number of steps up from 1, held as a QValue, or packed into an int key
+
+    def _exact(self, step):
+        """ the value step steps up from 1, rounded once, from an integer mantissa and a power
+        of ten where there are mantissas, so 18 and 10**2 give 0.18, where 1.8*0.1 gives
+        0.18000000000000002, and as __call__() works it out otherwise"""
+        decade, index = divmod(step, self._steps)
+        if self._mantissas is not None:
+            places = self._places-decade
+            if 0<=places<len(_TENS):
+                return self._mantissas[index]/_TENS[places]
+            if -len(_TENS)<places<0:
+                return self._mantissas[index]*_TENS[-places]
+        return self.basis[index]*self._power(decade)
+
+    def value(self, x, nearest=0, offset=0):
+        """ quantise x as __call__() does, but return a QValue, which holds the result exactly
+
+        >>> v = qE12.value(0.18)
+        >>> v, float(v), qE12(0.18)
+        (series('E12').at(-1, 3), 0.18, 0.18000000000000002)
+        >>> float(v.shift(-4)), v.shift(9)==qE12.at(0, 0)==1, v>qE12.value(0.15)
+        (0.082, True, True)
+        """
+        x_test = abs(x)
+        if x_test<1e-100:
+            return QValue(self, 0, 0)
+        exp, scaled = self.split(x_test)
+        if nearest==0:
+            index = bisect_right(self._mids, scaled)
+        elif nearest>0:
+            index = bisect_left(self.basis, scaled*_SNAP_DOWN)
+        else:
+            index = bisect_right(self.basis, scaled*_SNAP_UP)-1
+        return QValue(self, exp*self._steps+index+offset, -1 if x<0 else 1)
+
+    def at(self, decade, index, sign=1):
+        """ return the QValue sign*basis[index]*base1**decade, index can step past either end"""
+        return QValue(self, decade*self._steps+index, sign)
+
+    def _steps_between(self, low, high):
+        """ return (first, last), the steps of the first value at or above low, and the last at or below high"""
+        if not 0<low<=high:
+            raise ValueError('need 0 < low <= high, got {!r} and {!r}'.format(low, high))
+        return self.value(low, 1).step, self.value(high, -1).step
+
+    def between(self, low, high):
+        """ yield every value from low to high, inclusive, in order, lazily, as exact floats
+
+        the bounds are quantised once, then it's one step at a time up the basis
+
+        >>> list(qE12.between(5, 20))
+        [5.6, 6.8, 8.2, 10.0, 12.0, 15.0, 18.0]
+        >>> sum(1 for _ in qE48.between(10, 1e6))
+        241
 
-    return quant
+        bounds that are values of the series are always included, even as __call__() gives them
+        >>> list(qE12.between(12, 33)), list(qE12.between(qE12(3.3e-12), 3.3e-12))
+        ([12.0, 15.0, 18.0, 22.0, 27.0, 33.0], [3.3e-12])
+        """
+        first, last = self._steps_between(low, high)
+        exact = self._exact
+        for step in range(first, last+1):
+            yield exact(step)
 
+    def between_array(self, low, high):
+        """ return a numpy array of every value from low to high, identical to list(between(low, high))
+
+        >>> make_quant([1, 2, 5, 10]).between_array(0.01, 1).tolist()
+        [0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0]
+        """
+        import numpy as np
+
+        first, last = self._steps_between(low, high)
+        return self.from_keys(np.arange(first, last+1, dtype=np.int64)+QValue.BIAS)
+
+    def keys(self, x, nearest=0, offset=0):
+        """ quantise the numpy array x, returning the int64 key of each result, see QValue.key
+
+        keys sort, compare and test equal exactly, and much faster than floats or QValues,
+        from_keys() turns them back into values"""
+        import numpy as np
+
+        x, live, exp, index = self._locate_array(x, nearest, offset)
+        step = exp*self._steps+index+QValue.BIAS
+        return np.where(live, np.where(x<0, -step, step), 0)
+
+    def from_keys(self, keys):
+        """ return a numpy array of the exact values of an array of keys, as float() of each QValue
+
+        >>> k = qE24.keys([0.47, -2.2e-9, 0.0, 1e6])
+        >>> k.argsort().tolist(), qE24.from_keys(k).tolist()
+        ([1, 2, 0, 3], [0.47, -2.2e-09, 0.0, 1000000.0])
+        """
+        import numpy as np
+
+        keys = np.asarray(keys, dtype=np.int64)
+        decade, index = np.divmod(np.abs(keys)-QValue.BIAS, self._steps)
+        powers = np.array(self._powers)
+        last = len(powers)-1
+        k = decade-self._lo
+        power = np.where(k<0, 0.0, powers[np.clip(k, 0, last)])
+        power = np.where(k>last, np.inf, power)
+        value = np.asarray(self.basis)[index]*power
+        if self._mantissas is not None:
+            tens = np.array(_TENS)
+            mantissas = np.array(self._mantissas, dtype=np.float64)[index]
+            places = self._places-decade
+            ten = tens[np.clip(np.abs(places), 0, len(tens)-1)]
+            value = np.where((0<=places) & (places<len(tens)), mantissas/ten, value)
+            value = np.where((-len(tens)<places) & (places<0), mantissas*ten, value)
+        return np.where(keys==0, 0.0, np.sign(keys)*value)
+
+
+# 10.0**n for n up to 22, all exact in a float
+_TENS = tuple(10.0**n for n in range(23))
+
+
+class QValue:
+    """ a quantised value, held exactly as its quantiser, a sign, and the number of steps up from 1
+
+    decade and index are divmod(step, steps), for sign*basis[index]*base1**decade
+    stepping is just adding to step, float() rounds once, from the mantissas and a table of
+    powers of ten where the quantiser has them, so 0.18 is 0.18, not 0.18000000000000002,
+    and values from the same quantiser compare on their steps, not their floats
+
+    key packs sign and step into one int that sorts in the order of the values,
+    it's 0 for zero, and sign*(BIAS+step) otherwise, BIAS keeping it clear of 0
+    sorting a list on .key, or numpy keys from Quantiser.keys(), is the fast way to sort many
+    """
+
+    __slots__ = ('quantiser', 'sign', 'step')
+
+    BIAS = 1<<40
+
+    def __init__(self, quantiser, step, sign=1):
+        self.quantiser = quantiser
+        self.sign = sign
+        self.step = step if sign else 0
+
+    @property
+    def decade(self):
+        return self.step//self.quantiser._steps
+
+    @property
+    def index(self):
+        return self.step%self.quantiser._steps
+
+    @property
+    def key(self):
+        return self.sign*(self.BIAS+self.step)
+
+    def shift(self, n):
+        """ return the value n steps further from zero, or nearer with n negative"""
+        return QValue(self.quantiser, self.step+n, self.sign)
+
+    def __float__(self):
+        if not self.sign:
+            return 0.0
+        return self.sign*self.quantiser._exact(self.step)
+
+    def __repr__(self):
+        decade, index = divmod(self.step, self.quantiser._steps)
+        sign = '' if self.sign==1 else ', {}'.format(self.sign)
+        return '{!r}.at({}, {}{})'.format(self.quantiser, decade, index, sign)
+
+    def __hash__(self):
+        return hash(float(self))
+
+    def _other(self, other):
+        """ other's key, if it's from the same quantiser, or else None"""
+        if type(other) is QValue and other.quantiser is self.quantiser:
+            return other.sign*(self.BIAS+other.step)
+        return None
+
+    def __eq__(self, other):
+        key = self._other(other)
+        if key is not None:
+            return self.key==key
+        try:
+            return float(self)==float(other)
+        except (TypeError, ValueError):
+            return NotImplemented
+
+    def __lt__(self, other):
+        key = self._other(other)
+        if key is not None:
+            return self.key<key
+        return float(self)<float(other)
+
+    def __le__(self, other):
+        key = self._other(other)
+        if key is not None:
+            return self.key<=key
+        return float(self)<=float(other)
+
+    def __gt__(self, other):
+        key = self._other(other)
+        if key is not None:
+            return self.key>key
+        return float(self)>float(other)
+
+    def __ge__(self, other):
+        key = self._other(other)
+        if key is not None:
+            return self.key>=key
+        return float(self)>=float(other)
+
+
+
+
+# the IEC 60063 E-series, as integer mantissas, E24 to two figures and E192 to three
+# the coarser series are every 2nd, 4th and 8th value of these, as the standard defines them
+
+_E24 = array.array('B', [10, 11, 12, 13, 15, 16, 18, 20, 22, 24, 27, 30,
+                         33, 36, 39, 43, 47, 51, 56, 62, 68, 75, 82, 91])
+
+_E192 = array.array('H', [100, 101, 102, 104, 105, 106, 107, 109, 110, 111, 113, 114,
+                          115, 117, 118, 120, 121, 123, 124, 126, 127, 129, 130, 132,
+                          133, 135, 137, 138, 140, 142, 143, 145, 147, 149, 150, 152,
+                          154, 156, 158, 160, 162, 164, 165, 167, 169, 172, 174, 176,
+                          178, 180, 182, 184, 187, 189, 191, 193, 196, 198, 200, 203,
+                          205, 208, 210, 213, 215, 218, 221, 223, 226, 229, 232, 234,
+                          237, 240, 243, 246, 249, 252, 255, 258, 261, 264, 267, 271,
+                          274, 277, 280, 284, 287, 291, 294, 298, 301, 305, 309, 312,
+                          316, 320, 324, 328, 332, 336, 340, 344, 348, 352, 357, 361,
+                          365, 370, 374, 379, 383, 388, 392, 397, 402, 407, 412, 417,
+                          422, 427, 432, 437, 442, 448, 453, 459, 464, 470, 475, 481,
+                          487, 493, 499, 505, 511, 517, 523, 530, 536, 542, 549, 556,
+                          562, 569, 576, 583, 590, 597, 604, 612, 619, 626, 634, 642,
+                          649, 657, 665, 673, 681, 690, 698, 706, 715, 723, 732, 741,
+                          750, 759, 768, 777, 787, 796, 806, 816, 825, 835, 845, 856,
+                          866, 876, 887, 898, 909, 920, 931, 942, 953, 965, 976, 988])
+
+# name: (mantissas, significant figures, tolerance)
+_E_TABLES = {'E3':   (_E24[::8], 2, 0.4),    # the standard only says wider than 20%
+             'E6':   (_E24[::4], 2, 0.2),
+             'E12':  (_E24[::2], 2, 0.1),
+             'E24':  (_E24, 2, 0.05),
+             'E48':  (_E192[::4], 3, 0.02),
+             'E96':  (_E192[::2], 3, 0.01),
+             'E192': (_E192, 3, 0.005)}
+
+_SERIES = {}
+for _name, (_mantissas, _figures, _tolerance) in _E_TABLES.items():
+    _scale = 10**(_figures-1)
+    _SERIES[_name] = Quantiser([m/_scale for m in _mantissas]+[10], _name, _tolerance)
+del _name, _mantissas, _figures, _tolerance, _scale
+
+
+def series(name):
+    """ return the Quantiser for the IEC 60063 series name, 'E3' to 'E192'
+
+    its name and tolerance are attributes, and its basis holds the values of one decade
+    raise ValueError for a name that isn't one of the series
+
+    >>> e96 = series('E96')
+    >>> e96.tolerance, len(e96.basis), e96.nearest(3.17e3), e96.floor(3.17e3), e96.ceil(3.17e3)
+    (0.01, 97, 3160.0, 3160.0, 3240.0)
+
+    >>> [(q.name, q.tolerance) for q in map(series, ('E3', 'E6', 'E12', 'E24', 'E48', 'E192'))]
+    [('E3', 0.4), ('E6', 0.2), ('E12', 0.1), ('E24', 0.05), ('E48', 0.02), ('E192', 0.005)]
+
+    every table agrees with the standard
+    >>> check_series()
+    []
+    """
+    try:
+        return _SERIES[name.upper()]
+    except (KeyError, AttributeError):
+        raise ValueError('unknown series {!r}, expected one of {}'.format(name, list(_SERIES))) from None
+
+
+
+def check_series():
+    """ return a list of (name, index, value, standard) for every E-series value that isn't IEC 60063
+
+    the standard's E24 and E192 are 10**(i/24) and 10**(i/192), rounded to two and three
+    figures, but for the older values it keeps, and each coarser series is every nth value"""
+    kept = {('E24', 10): 2.7, ('E24', 11): 3.0, ('E24', 12): 3.3, ('E24', 13): 3.6,
+            ('E24', 14): 3.9, ('E24', 15): 4.3, ('E24', 16): 4.7, ('E24', 22): 8.2,
+            ('E192', 185): 9.2}
+    wrong = []
+    for name, q in _SERIES.items():
+        n = int(name[1:])
+        parent, figures = ('E24', 1) if n<=24 else ('E192', 2)
+        every = int(parent[1:])//n
+        standard = []
+        for i in range(0, int(parent[1:]), every):
+            standard.append(kept.get((parent, i), round(10**(i/int(parent[1:])), figures)))
+        standard.append(10.0)
+        if len(q.basis)!=len(standard):
+            wrong.append((name, None, len(q.basis), len(standard)))
+            continue
+        for i, (value, std) in enumerate(zip(q.basis, standard)):
+            if value!=std:
+                wrong.append((name, i, value, std))
+    return wrong
 
 
 
@@ -143,50 +643,676 @@ q125 = make_quant([1, 2, 5, 10])   # nice oscilloscope and graph increments
 
 qE2 = make_quant([1, 3, 10])    # roughly 10dB steps, beloved of RF attenuators
 
-qE3 = make_quant([1.0, 2.2, 4.7, 10.0]) # very coarse resistor steps
+qE3 = series('E3')     # very coarse resistor steps
 
 qE5 = make_quant([1.0, 1.6, 2.5, 4.0, 6.3, 10.0]) # often seen as capacitor voltages
 
-qE6 = make_quant([1.0, 1.5, 2.2, 3.3, 4.7, 6.8, 10.0]) # coarse resistor steps
+qE6 = series('E6')     # coarse resistor steps
 
 qE10 = make_quant([1.0, 1.25, 1.6, 2.0, 2.5,
                     3.2, 4.0, 5.0, 6.3, 8.0, 10.0]) # log10 approxmimation
                                                     # I'm trying to learn these
                                                     # for mental arithmetic
 
-qE12 = make_quant([1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3,
-                         3.9, 4.7, 5.6, 6.8, 8.2, 10.0])  # common resistor steps
-
-qE24 = make_quant([1.0, 1.1, 1.2, 1.3, 1.5, 1.6,           # common professional resistor steps
-                         1.8, 2.0, 2.2, 2.4, 2.7, 3.0,     # E12 superset
-                         3.3, 3.6, 3.9, 4.3, 4.7, 5.1,
-                         5.6, 6.2, 6.8, 7.5, 8.2, 9.1, 10.0]) 
-
-qE48 = make_quant([1.00, 1.05, 1.10, 1.15, 1.21, 1.27,       # fine resistor steps
-                        1.33, 1.40, 1.47, 1.54, 1.62, 1.69,  # NOT an E24 superset
-                        1.78, 1.87, 1.96, 2.05, 2.15, 2.26,
-                        2.37, 2.49, 2.61, 2.74, 2.87, 3.01,
-                        3.16, 3.32, 3.48, 3.65, 3.83, 4.02,
-                        4.22, 4.42, 4.64, 4.87, 5.11, 5.36,
-                        5.62, 5.90, 6.19, 6.49, 6.81, 7.15,
-                        7.50, 7.87, 8.25, 8.66, 9.09, 9.53, 10.0])
-
-qE96 = make_quant([1.00, 1.02, 1.05, 1.07, 1.10, 1.13,        # very fine resistor steps
-                        1.15, 1.18, 1.21, 1.24, 1.27, 1.30,   # E48 superset
-                        1.33, 1.37, 1.40, 1.43, 1.47, 1.50,
-                        1.54, 1.58, 1.62, 1.65, 1.69, 1.74,
-                        1.78, 1.82, 1.87, 1.91, 1.96, 2.00,
-                        2.05, 2.10, 2.16, 2.21, 2.36, 2.32,
-                        2.37, 2.43, 2.49, 2.55, 2.61, 2.67,
-                        2.74, 2.80, 2.87, 2.94, 3.01, 3.09,
-                        3.16, 3.24, 3.32, 3.40, 3.48, 3.57,
-                        3.65, 3.74, 3.83, 3.92, 4.02, 4.12,
-                        4.22, 4.32, 4.42, 4.53, 4.64, 4.75,
-                        4.87, 4.91, 5.11, 5.23, 5.36, 5.49,
-                        5.62, 5.76, 5.90, 6.04, 6.19, 6.34,
-                        6.49, 6.65, 6.81, 6.98, 7.15, 7.32,
-                        7.50, 7.68, 7.87, 8.06, 8.25, 8.45,
-                        8.66, 8.87, 9.09, 9.31, 9.59, 9.76, 10.0])
+qE12 = series('E12')   # common resistor steps
+
+qE24 = series('E24')   # common professional resistor steps, E12 superset
+
+qE48 = series('E48')   # fine resistor steps, NOT an E24 superset
+
+qE96 = series('E96')   # very fine resistor steps, E48 superset
+
+qE192 = series('E192') # precision resistor steps, E96 superset
+
+
+
+# the pair solvers work on one table of values for each quantiser, a few ranges either side
+# of the one the target falls in, the target is scaled into that range, and the answers
+# scaled back out, so the same table serves every target
+
+Pair = collections.namedtuple('Pair', 'value error how r1 r2')
+PairArrays = collections.namedtuple('PairArrays', 'value error how r1 r2')
+
+SERIES = 0
+PARALLEL = 1
+_HOW = {'series':SERIES, 'parallel':PARALLEL}
+
+
+@functools.lru_cache(maxsize=32)
+def _pair_table(q, decades):
+    """ return (values, index, exp), the basis values of q over exp = -decades to +decades, in order"""
+    values = []
+    index = []
+    exps = []
+    for exp in range(-decades, decades+1):
+        for i in range(q._steps):
+            values.append(q.basis[i]*q._power(exp))
+            index.append(i)
+            exps.append(exp)
+    return values, index, exps
+
+
+def _how_codes(how):
+    if isinstance(how, str):
+        how = (how,)
+    try:
+        return tuple(sorted(set(_HOW[h] for h in how)))
+    except KeyError:
+        raise ValueError('how must be series or parallel, or both, got {!r}'.format(how)) from None
+
+
+def pairs(target, q=None, k=5, how=('series', 'parallel'), decades=3):
+    """ return the k pairs of values from q that come closest to target, best first
+
+    q           the quantiser to take values from, defaults to qE24
+    how         'series', 'parallel', or both, the default
+    decades     how many ranges above and below the target's to take the values from
+
+    each is a Pair(value, error, how, r1, r2), where value is what the pair makes,
+    error is value/target-1, how is SERIES or PARALLEL, and r1 <= r2
+    r1 and r2 are exactly what q() gives for them
+
+    the values are walked with two pointers, one up from the smallest, one down from the
+    largest, as the partner each needs moves only one way, so each target costs one pass
+    each value is tried with the k partners either side of its ideal one, and where every
+    pair overshoots, with the k values that follow it, which is enough for the k best
+
+    >>> [(p.r1, p.r2) for p in pairs(4.5497, k=1)]
+    [(9.1, 9.1)]
+
+    >>> for p in pairs(3.17e3, k=3):
+    ...     print('{:.0f} {:+.5f} {} {:.0f} {:.0f}'.format(p.value, p.error, p.how, p.r1, p.r2))
+    3170 +0.00000 0 470 2700
+    3172 +0.00074 1 3300 82000
+    3166 -0.00137 1 4300 12000
+    """
+    if q is None:
+        q = qE24
+    if not target>0:
+        raise ValueError('target must be positive, got {!r}'.format(target))
+    codes = _how_codes(how)
+    values, index, exps = _pair_table(q, decades)
+    exp, t = q.split(target)
+    n = len(values)
+
+    found = []      # (abs error, how, i, j), i and j into values, with values[i] <= values[j]
+
+    def made(code, i, j):
+        a = values[i]
+        b = values[j]
+        return a+b if code==SERIES else a*b/(a+b)
+
+    def nearest(code, i, j):
+        """ the k partners of values[i] each side of values[j], its ideal partner, or below it"""
+        for b in range(max(i, j-k+1), min(j+k+1, n)):
+            found.append((abs(made(code, i, b)-t), code, i, b))
+
+    def beyond(code, i):
+        """ from values[i] on every pair overshoots, more so the bigger either value,
+        so the k best can only be pairs of the k values from i"""
+        for a in range(i, min(i+k, n)):
+            for b in range(a, min(i+k, n)):
+                found.append((made(code, a, b)-t, code, a, b))
+
+    if SERIES in codes:
+        j = n-1
+        for i in range(n):
+            a = values[i]
+            if a+a>t:
+                beyond(SERIES, i)
+                break
+            want = t-a
+            while j>i and values[j]>want:
+                j -= 1
+            nearest(SERIES, i, j)
+    if PARALLEL in codes:
+        start = bisect_left(values, t)
+        # a value below t with anything comes up short, least so with the largest values
+        for i in range(max(start-k, 0), start):
+            for b in range(max(i, n-k), n):
+                found.append((t-made(PARALLEL, i, b), PARALLEL, i, b))
+        j = n-1
+        for i in range(start, n):
+            a = values[i]
+            if a>t+t:
+                beyond(PARALLEL, i)
+                break
+            want = a*t/(a-t) if a>t else math.inf
+            while j>i and values[j]>want:
+                j -= 1
+            nearest(PARALLEL, i, j)
+
+    out = []
+    for _, code, i, j in sorted(found)[:k]:
+        r1 = q.basis[index[i]]*q._power(exps[i]+exp)
+        r2 = q.basis[index[j]]*q._power(exps[j]+exp)
+        value = r1+r2 if code==SERIES else r1*r2/(r1+r2)
+        out.append(Pair(value, value/target-1, code, r1, r2))
+    out.sort(key=lambda p: abs(p.error))
+    return out
+
+
+def pairs_array(targets, q=None, k=5, how=('series', 'parallel'), decades=3, chunk=1024):
+    """ pairs() for a whole array of targets, returning PairArrays of numpy arrays, shape (len(targets), k)
+
+    the fields are those of Pair, in rows best first, how being SERIES or PARALLEL
+    the same table of values serves every target, and chunk targets are searched at once
+    needs numpy, which is only imported when this is called
+
+    >>> best = pairs_array([3.17e3, 1.1e6], k=2)
+    >>> best.r1.tolist(), best.r2.tolist()
+    ([[470.0, 3300.0], [100000.0, 2200000.0]], [[2700.0, 82000.0], [1000000.0, 2200000.0]])
+    >>> pairs_array([4.5497], k=1).r1.tolist()
+    [[9.1]]
+    """
+    import numpy as np
+
+    if q is None:
+        q = qE24
+    targets = np.asarray(targets, dtype=np.float64).ravel()
+    if not (targets>0).all():
+        raise ValueError('targets must be positive')
+    codes = _how_codes(how)
+    values, index, exps = _pair_table(q, decades)
+    values = np.array(values)
+    index = np.array(index)
+    exps = np.array(exps)
+    powers = np.array(q._powers)
+    basis = np.array(q.basis)
+    n = len(values)
+    k = min(k, n*n)
+
+    fields = {name: [] for name in PairArrays._fields}
+    for start in range(0, len(targets), chunk):
+        target = targets[start:start+chunk]
+        split = [q.split(float(x)) for x in target]
+        exp = np.array([e for e, _ in split])
+        t = np.array([s for _, s in split])[:, None]
+
+        # the same pairs as pairs() tries, as columns of (i, j) for every target at once
+        m = len(target)
+        a = values[None, :]
+        i = np.broadcast_to(np.arange(n), (m, n))
+        errs = []
+        pair_i = []
+        pair_j = []
+        pair_how = []
+
+        def add(code, i, j, ok):
+            ok = ok & (j>=i) & (i>=0) & (j<n)
+            i = np.clip(i, 0, n-1)
+            j = np.clip(j, 0, n-1)
+            a = values[i]
+            b = values[j]
+            made = a+b if code==SERIES else a*b/(a+b)
+            errs.append(np.where(ok, np.abs(made-t), np.inf))
+            pair_i.append(i)
+            pair_j.append(j)
+            pair_how.append(np.full(i.shape, code))
+
+        def beyond(code, first):
+            # the pairs of the k values from first on, where every pair overshoots
+            for d in range(k):
+                for e in range(d, k):
+                    add(code, first+d, first+e, np.ones((m, 1), dtype=bool))
+
+        for code in codes:
+            if code==SERIES:
+                want = t-a
+                usable = a+a<=t
+                beyond(SERIES, np.searchsorted(values, t/2, side='right'))
+            else:
+                with np.errstate(divide='ignore'):
+                    want = np.where(a>t, a*t/np.where(a>t, a-t, 1.0), np.inf)
+                usable = (a>=t) & (a<=t+t)
+                beyond(PARALLEL, np.searchsorted(values, t+t, side='right'))
+                # the values below t, each with the largest values
+                start = np.searchsorted(values, t, side='left')
+                for d in range(1, k+1):
+                    for e in range(1, k+1):
+                        add(PARALLEL, start-d, np.full((m, 1), n-e), np.ones((m, 1), dtype=bool))
+            below = np.maximum(np.searchsorted(values, want, side='right')-1, i)
+            for d in range(-k+1, k+1):
+                add(code, i, below+d, usable)
+        errs = np.concatenate(errs, axis=1)
+        pair_i = np.concatenate(pair_i, axis=1)
+        pair_j = np.concatenate(pair_j, axis=1)
+        pair_how = np.concatenate(pair_how, axis=1)
+
+        best = np.argpartition(errs, k-1, axis=1)[:, :k]
+        rows = np.arange(len(target))[:, None]
+        bi = pair_i[rows, best]
+        bj = pair_j[rows, best]
+        code = pair_how[rows, best]
+
+        # scaled back out exactly as pairs() does, so the values are those q() gives
+        r1 = basis[index[bi]]*powers[exps[bi]+exp[:, None]-q._lo]
+        r2 = basis[index[bj]]*powers[exps[bj]+exp[:, None]-q._lo]
+        value = np.where(code==SERIES, r1+r2, r1*r2/(r1+r2))
+        error = value/target[:, None]-1
+        # ties go as pairs() has them, series first, then the smaller values
+        order = np.lexsort((bj, bi, code, np.abs(error)), axis=1)
+        for name, field in (('value', value), ('error', error), ('how', code), ('r1', r1), ('r2', r2)):
+            fields[name].append(field[rows, order])
+
+    return PairArrays(*(np.concatenate(fields[name]) for name in PairArrays._fields))
+
+
+
+# the ratio solvers work on one table for each quantiser, of every ratio basis[i]/basis[j],
+# moved into the range 1 to base1, in order, and the ratios repeat in every range,
+# so walking off either end of the table carries on at the other, a range along
+
+Divider = collections.namedtuple('Divider', 'value error r1 r2')
+DividerArrays = collections.namedtuple('DividerArrays', 'value error r1 r2')
+
+
+@functools.lru_cache(maxsize=32)
+def _ratio_table(q):
+    """ return (logs, i, j, shift), in order of log(basis[i]*base1**shift/basis[j])"""
+    entries = []
+    for i in range(q._steps):
+        for j in range(q._steps):
+            shift = 0 if q.basis[i]>=q.basis[j] else 1
+            entries.append((math.log(q.basis[i]*q._power(shift)/q.basis[j]), i, j, shift))
+    entries.sort()
+    return tuple(tuple(column) for column in zip(*entries))
+
+
+def _ratio_target(target, kind):
+    """ return R1/R2 for a target of that kind"""
+    if kind=='ratio':
+        if not target>0:
+            raise ValueError('a ratio target must be positive, got {!r}'.format(target))
+        return target
+    if kind=='divider':
+        if not 0<target<1:
+            raise ValueError('a divider target must be between 0 and 1, got {!r}'.format(target))
+        return 1/target-1
+    raise ValueError("kind must be 'ratio' or 'divider', got {!r}".format(kind))
+
+
+def _made(r1, r2, kind):
+    """ what r1 and r2 make, R1/R2 or R2/(R1+R2)"""
+    if kind=='ratio':
+        return r1/r2
+    return r2/(r1+r2)
+
+
+def _scale_for(q, i, j, up, total):
+    """ return the range of r2 for r1 = basis[i]*base1**up, that puts r1+r2 nearest the
+    geometric middle of the total window, or None if no range puts it inside"""
+    if total is None:
+        return 0
+    lo, hi = total
+    size = q.basis[i]*q._power(up)+q.basis[j]
+    e = round(math.log(math.sqrt(lo*hi)/size)/q._log_base1)
+    # the log only gets e close, so step it until the totals are in the window
+    for e in sorted(range(e-2, e+3), key=lambda x: abs(x-e)):
+        made = q.basis[i]*q._power(e+up)+q.basis[j]*q._power(e)
+        if lo<=made<=hi:
+            return e
+    return None
+
+
+def ratios(target, q=None, k=5, tolerance=None, total=None, kind='ratio'):
+    """ return up to k pairs r1, r2 of values from q whose ratio comes closest to target, best first
+
+    q           the quantiser to take values from, defaults to qE96
+    k           the most solutions to return, None for all within tolerance
+    tolerance   if given, only return solutions whose error is within it
+    total       (low, high), if given, r1+r2 must be within it, the pair is scaled so that
+                r1+r2 is as near the geometric middle of the window as the ranges allow
+                otherwise r2 is in the first range, from 1 up
+    kind        'ratio' for a target of r1/r2, as for regulator feedback, Vout = Vref*(1+r1/r2)
+                'divider' for r2/(r1+r2), the fraction a divider passes, as for an attenuator
+
+    each is a Divider(value, error, r1, r2), value being r1/r2 or r2/(r1+r2), and error value/target-1
+    a ratio that no scaling fits into the total window is passed over
+
+    the ratio table is walked out from the target both ways at once, taking whichever
+    side is closer next, so the solutions come out in order, and the walk stops at k
+
+    >>> for d in ratios(3.3/0.8-1, k=3, total=(10e3, 200e3)):
+    ...     print('{:.5f} {:+.5f} {:.0f} {:.0f}'.format(d.value, d.error, d.r1, d.r2))
+    3.10435 -0.00661 35700 11500
+    3.14706 +0.00706 107000 34000
+    3.10280 -0.00710 33200 10700
+
+    >>> [tuple(d[2:]) for d in ratios(0.1, q=qE24, k=3, kind='divider', total=(1e3, 1e6))]
+    [(18000.0, 2000.0), (27000.0, 3000.0), (82000.0, 9100.0)]
+
+    >>> [(d.r1, d.r2) for d in ratios(2, q=qE12, k=None, tolerance=0.04)]
+    [(6.8, 3.3), (5.6, 2.7)]
+    """
+    if q is None:
+        q = qE96
+    if k is None and tolerance is None:
+        raise ValueError('give k or tolerance, or both, to stop the search')
+    t = _ratio_target(target, kind)
+    if total is not None:
+        total = (min(total), max(total))
+    logs, ii, jj, shifts = _ratio_table(q)
+    n = len(logs)
+    exp, scaled = q.split(t)
+    position = bisect_left(logs, math.log(scaled))
+
+    def candidate(p):
+        """ (abs error, error, i, j, up) for entry p, which can be off either end of the table"""
+        wrap, p = divmod(p, n)
+        up = shifts[p]+exp+wrap
+        value = q.basis[ii[p]]*q._power(up)/q.basis[jj[p]]
+        if kind=='divider':
+            value = 1/(1+value)
+        error = value/target-1
+        return abs(error), error, ii[p], jj[p], up
+
+    out = []
+    below = position-1
+    above = position
+    low = candidate(below)
+    high = candidate(above)
+    for _ in range(2*n):      # a whole range each way is as far as it's worth going
+        if low[0]<=high[0]:
+            best = low
+            below -= 1
+            low = candidate(below)
+        else:
+            best = high
+            above += 1
+            high = candidate(above)
+        if tolerance is not None and best[0]>tolerance:
+            break
+        _, error, i, j, up = best
+        e = _scale_for(q, i, j, up, total)
+        if e is None:
+            continue
+        r1 = q.basis[i]*q._power(e+up)
+        r2 = q.basis[j]*q._power(e)
+        value = _made(r1, r2, kind)
+        out.append(Divider(value, value/target-1, r1, r2))
+        if k is not None and len(out)>=k:
+            break
+    return out
+
+
+def ratios_array(targets, q=None, k=1, total=None, kind='ratio', width=16):
+    """ ratios() for a whole array of targets, returning DividerArrays of numpy arrays, shape (len(targets), k)
+
+    the fields are those of Divider, best first, and nan where fewer than k were found
+    the width nearest ratios each side of each target are looked at, all at once
+    needs numpy, which is only imported when this is called
+
+    >>> best = ratios_array([3.3/0.8-1, 5/1.25-1, 12/0.6-1], total=(10e3, 200e3))
+    >>> best.r1[:, 0].tolist(), best.r2[:, 0].tolist()
+    ([35700.0, 102000.0, 21500.0], [11500.0, 34000.0, 1130.0])
+    """
+    import numpy as np
+
+    if q is None:
+        q = qE96
+    targets = np.asarray(targets, dtype=np.float64).ravel()
+    t = np.array([_ratio_target(float(x), kind) for x in targets])
+    logs, ii, jj, shifts = (np.array(column) for column in _ratio_table(q))
+    n = len(logs)
+    width = min(width, n)
+    basis = np.array(q.basis)
+    powers = np.array(q._powers)
+    lo = q._lo
+
+    def power(e):
+        return powers[np.clip(e-lo, 0, len(powers)-1)]
+
+    split = [q.split(float(x)) for x in t]
+    exp = np.array([e for e, _ in split])[:, None]
+    position = np.searchsorted(logs, np.log([s for _, s in split]))[:, None]
+
+    # the width entries each side, off either end of the table wrapping into the next range
+    wrap, p = np.divmod(position+np.arange(-width, width), n)
+    i = ii[p]
+    j = jj[p]
+    up = shifts[p]+exp+wrap
+
+    if total is None:
+        e = np.zeros(i.shape, dtype=np.int64)
+        fits = np.ones(i.shape, dtype=bool)
+    else:
+        t_lo, t_hi = min(total), max(total)
+        size = basis[i]*power(up)+basis[j]
+        middle = np.round(np.log(math.sqrt(t_lo*t_hi)/size)/q._log_base1).astype(np.int64)
+        e = middle.copy()
+        fits = np.zeros(i.shape, dtype=bool)
+        for step in (0, -1, 1, -2, 2):      # nearest the middle first, as ratios() tries them
+            tried = middle+step
+            made = basis[i]*power(tried+up)+basis[j]*power(tried)
+            ok = ~fits & (t_lo<=made) & (made<=t_hi)
+            e = np.where(ok, tried, e)
+            fits |= ok
+
+    r1 = basis[i]*power(e+up)
+    r2 = basis[j]*power(e)
+    value = r1/r2 if kind=='ratio' else r2/(r1+r2)
+    error = value/targets[:, None]-1
+    rank = np.where(fits, np.abs(error), np.inf)
+
+    k = min(k, 2*width)
+    best = np.argsort(rank, axis=1, kind='stable')[:, :k]
+    rows = np.arange(len(targets))[:, None]
+    found = np.isfinite(rank[rows, best])
+    return DividerArrays(*(np.where(found, field[rows, best], np.nan) for field in (value, error, r1, r2)))
+
+
+
+# the best fit from several series, all over one range, is worked out once for each stretch
+# of the range between the breakpoints, where a value changes from nearer one basis value to
+# nearer the next, in any of the series, or comes into or goes out of tolerance of one
+
+Fit = collections.namedtuple('Fit', 'value error series')
+FitArrays = collections.namedtuple('FitArrays', 'value error series')
+
+
+class BestFit:
+    """ quantise to the first of several series that gets within tolerance, or the closest if none do
+
+    quantisers  quantisers, or names for series(), in order of preference, the coarser first
+    tolerance   how far, relatively, a value can be from x, and still be taken in preference
+
+    calling it with x returns a Fit(value, error, series), error being value/x-1 and series the
+    quantiser that the value came from, exactly as its QValue gives it
+    if none are within tolerance, the geometrically nearest is taken, as a quantiser would take
+    it, the earlier series winning a tie
+    the series must all repeat over the same range, like the E-series over 10
+
+    the breakpoints, where the choice can change, are the midpoints of each series, and of
+    all their values together, and the tolerance edges of every value, a bisect finds the
+    stretch that x is in, and the choice for each stretch is worked out here, once
+
+    >>> fit = BestFit(('E12', 'E24', 'E96'), tolerance=0.02)
+    >>> [(v, s.name) for v, _, s in map(fit, [4.7e3, 5.1e3, 5.23e3, 7.5])]
+    [(4700.0, 'E12'), (5100.0, 'E24'), (5230.0, 'E96'), (7.5, 'E24')]
+    >>> best = fit.fit_array([4.7e3, 5.1e3, 5.23e3, 7.5])
+    >>> best.value.tolist(), [fit.series[k].name for k in best.series]
+    ([4700.0, 5100.0, 5230.0, 7.5], ['E12', 'E24', 'E96', 'E24'])
+    """
+
+    __slots__ = ('series', 'tolerance', '_breaks', '_which', '_index')
+
+    def __init__(self, quantisers, tolerance):
+        self.series = tuple(q if isinstance(q, Quantiser) else series(q) for q in quantisers)
+        if not self.series:
+            raise ValueError('need at least one series')
+        base1 = self.series[0]._base1
+        for q in self.series:
+            if q._base1!=base1:
+                raise ValueError('all the series must have the same range, {!r} has {:g}, not {:g}'.format(q, q._base1, base1))
+        if not tolerance>=0:
+            raise ValueError('tolerance must be positive, got {!r}'.format(tolerance))
+        self.tolerance = tolerance
+
+        # every x where the choice can change, in 1 to base1, then the choice in each stretch
+        breaks = {1.0}
+        values = sorted({b for q in self.series for b in q.basis})
+        breaks.update(math.sqrt(low*high) for low, high in zip(values, values[1:]))
+        for q in self.series:
+            breaks.update(q._mids)
+            for b in q.basis:
+                breaks.update(edge for edge in (b/(1+tolerance), b/(1-tolerance) if tolerance<1 else math.inf)
+                              if 1<edge<base1)
+        self._breaks = tuple(sorted(breaks))
+        ends = self._breaks[1:]+(base1,)
+        which = []
+        index = []
+        for low, high in zip(self._breaks, ends):
+            k, i = self._choose(math.sqrt(low*high))
+            which.append(k)
+            index.append(i)
+        self._which = tuple(which)
+        self._index = tuple(index)
+
+    def _choose(self, scaled):
+        """ return (k, i), series[k].basis[i] being the choice for scaled, in 1 to base1"""
+        best = None
+        for k, q in enumerate(self.series):
+            i = bisect_right(q._mids, scaled)
+            if abs(q.basis[i]/scaled-1)<=self.tolerance:
+                return k, i
+            distance = abs(math.log(q.basis[i]/scaled))
+            if best is None or distance<best[0]:
+                best = (distance, k, i)
+        return best[1:]
+
+    def __repr__(self):
+        return 'BestFit({!r}, tolerance={!r})'.format(self.series, self.tolerance)
+
+    def __call__(self, x):
+        x_test = abs(x)
+        if x_test<1e-100:
+            return Fit(0.0, 0.0, self.series[0])
+        exp, scaled = self.series[0].split(x_test)
+        segment = bisect_right(self._breaks, scaled)-1
+        q = self.series[self._which[segment]]
+        value = q._exact(exp*q._steps+self._index[segment])
+        if x<0:
+            value = -value
+        return Fit(value, value/x-1, q)
+
+    def fit_array(self, x):
+        """ return FitArrays of numpy arrays, as calling for each element of x
+
+        series is an array of indexes into self.series
+        needs numpy, which is only imported when this is called"""
+        import numpy as np
+
+        x, live, exp, scaled = self.series[0]._split_array(x)
+        segment = np.searchsorted(self._breaks, scaled, side='right')-1
+        which = np.asarray(self._which)[segment]
+        index = np.asarray(self._index)[segment]
+        value = np.zeros(x.shape)
+        for k, q in enumerate(self.series):
+            mine = which==k
+            value[mine] = q.from_keys(exp[mine]*q._steps+index[mine]+QValue.BIAS)
+        value = np.where(live, np.where(x<0, -value, value), 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            error = np.where(live, value/np.where(live, x, 1.0)-1, 0.0)
+        return FitArrays(value, error, np.where(live, which, 0))
+
+
+
+Ticks = collections.namedtuple('Ticks', 'low high step count ticks labels')
+
+
+def ticks(lows, highs, counts=5, q=None, **options):
+    """ return Ticks, nice axis ranges and ticks for many axes at once, as numpy arrays
+
+    lows, highs the range of the data on each axis, numbers or arrays
+    counts      the most ticks wanted on each axis, at least 2, and 3 for a range either side of 0
+    q           the quantiser to take tick steps from, defaults to q125
+    options     for engineering_conversions.eng_str_array(), which makes the labels
+
+    low, high   each axis range, widened out to the ticks
+    step        the tick spacing, the smallest step of q that fits the range in count ticks
+    count       the number of ticks on each axis
+    ticks       a 2d array, a row for each axis, padded with nan after its count
+    labels      a list of lists of strings, eng_str() style, a list for each axis
+
+    a range too narrow for its size to tick in floats gets wider steps, and fewer ticks
+
+    the ticks are whole multiples of the step, worked out from the integer mantissas where
+    q has them, as QValue does, so 0.6 is 0.6, and not 0.6000000000000001
+
+    >>> t = ticks([0, -3.3e-6, 0.3], [1, 12e-6, 9.7], [6, 5, 5])
+    >>> t.step.tolist(), t.count.tolist()
+    ([0.2, 5e-06, 5.0], [6, 5, 3])
+    >>> t.labels
+    [['0', '200m', '400m', '600m', '800m', '1'], ['-5u', '0', '5u', '10u', '15u'], ['0', '5', '10']]
+
+    >>> ticks([-4.75e-6, -1], [124909.7, 1], [11, 2]).labels
+    [['-20k', '0', '20k', '40k', '60k', '80k', '100k', '120k', '140k'], ['-1', '0', '1']]
+
+    a range narrower than 1e-100, the quantiser's zero, gets ticks about that far apart
+    >>> ticks([1e-300, 0], [2e-300, 1e-200]).labels
+    [['0', '50e-102'], ['0', '50e-102']]
+    """
+    import numpy as np
+    from engineering_conversions import eng_str_array      # only when there are labels to make
+
+    if q is None:
+        q = q125
+    lows, highs, counts = np.broadcast_arrays(np.asarray(lows, dtype=np.float64),
+                                              np.asarray(highs, dtype=np.float64),
+                                              np.asarray(counts, dtype=np.int64))
+    lows, highs, counts = (a.ravel() for a in (np.minimum(lows, highs), np.maximum(lows, highs), counts))
+    if (counts<2).any():
+        raise ValueError('need at least 2 ticks on every axis, got {}'.format(counts.min()))
+    # 0 is always a tick, so a range either side of it needs 3
+    counts = np.where((counts==2) & (lows<0) & (highs>0), 3, counts)
+    span = highs-lows
+    # an empty range gets ticks around its value, or around 0 to 1 at 0
+    span = np.where(span>0, span, np.where(lows!=0, np.abs(lows), 1.0))
+
+    def multiples(k, key, step):
+        """ k times the step, k*mantissa over a power of ten where that's exact, as QValue does"""
+        values = k*step
+        if q._mantissas is not None:
+            decade, index = np.divmod(key-QValue.BIAS, q._steps)
+            places = q._places-decade
+            whole = k*np.array(q._mantissas, dtype=np.float64)[index]
+            tens = np.array(_TENS)
+            ten = tens[np.clip(np.abs(places), 0, len(tens)-1)]
+            exact = (np.abs(places)<len(tens)) & (np.abs(whole)<2**53)
+            values = np.where(exact & (places>=0), whole/ten, values)
+            values = np.where(exact & (places<0), whole*ten, values)
+        return values
+
+    # a step below the smallest that could do, as highs-lows can come out a little over,
+    # then up a step at a time where it gives too many ticks
+    # and none below 1e-100, which the quantiser takes as zero
+    key = q.keys(np.maximum(span/(counts-1), 1e-100), nearest=1, offset=-1)
+    while True:
+        step = q.from_keys(key)
+        # the division can be out by an ulp, so the end ticks are checked against the range
+        first = np.floor(lows/step)
+        first = np.where(multiples(first, key, step)>lows, first-1, first)
+        first = np.where(multiples(first+1, key, step)<=lows, first+1, first)
+        last = np.ceil(highs/step)
+        last = np.where(multiples(last, key, step)<highs, last+1, last)
+        last = np.where(multiples(last-1, key, step)>=highs, last-1, last)
+        last = np.maximum(last, first+1)
+        # or where the multiples are too big to tell apart in a float, for a range narrow for its size
+        many = (last-first+1>counts) | (np.maximum(np.abs(first), np.abs(last))>2**50)
+        if not many.any():
+            break
+        key = key+many
+    count = (last-first+1).astype(np.int64)
+
+    k = first[:, None]+np.arange(count.max())
+    values = multiples(k, key[:, None], step[:, None])
+    values = np.where(np.arange(count.max())<count[:, None], values, np.nan)
+
+    labels = eng_str_array(values[~np.isnan(values)], **options).tolist()
+    ends = np.cumsum(count)
+    labels = [labels[end-n:end] for n, end in zip(count, ends)]
+    return Ticks(values[:, 0], values[np.arange(len(count)), count-1], step, count, values, labels)
 
 
            
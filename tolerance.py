@@ -0,0 +1,279 @@
+""" Monte Carlo tolerance analysis of networks of components from the quantiser series
+
+part() makes a component from a nominal value and a series, taking the series tolerance
+simulate() draws every component, trial after trial, a chunk of trials at a time as numpy
+arrays, runs them through a vectorised network function, and keeps running statistics
+of the results, so a million trials need no more memory than one chunk
+
+the draws can be uniform over the tolerance, gaussian, with the tolerance at some number
+of sigmas, or binned, gaussian with the middle taken out, as when the tighter parts have
+been sorted out and sold as the better grade
+
+each chunk has its own seed, spawned from one SeedSequence, so the results for a seed are
+the same whether the chunks are run here, or over a pool of processes
+
+needs numpy
+"""
+
+"""
+Copyright (c) <2016>, <Neil Thomas>, <NeilT-UK>, <dc_fm@hotmail.com>
+All rights reserved.
+
+Redistribution and use in source and binary forms, with or without
+modification, are permitted provided that the following conditions are met:
+
+1. Redistributions of source code must retain the above copyright notice, this
+   list of conditions and the following disclaimer. 
+2. Redistributions in binary form must reproduce the above copyright notice,
+   this list of conditions and the following disclaimer in the documentation
+   and/or other materials provided with the distribution.
+
+THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT OWNER OR CONTRIBUTORS BE LIABLE FOR
+ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES
+(INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND
+ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+(INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
+SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+The views and conclusions contained in the software and documentation are those
+of the authors and should not be interpreted as representing official policies, 
+either expressed or implied, of the FreeBSD Project.
+"""
+
+import collections
+import math
+import os
+
+import numpy as np
+
+import quantiser
+
+version = '1.0     October 2026'
+
+DISTRIBUTIONS = ('uniform', 'gaussian', 'binned')
+
+# the standard tolerances, tightest first, for the default inner edge of a binned part
+_TOLERANCES = sorted(quantiser.series(name).tolerance
+                     for name in ('E3', 'E6', 'E12', 'E24', 'E48', 'E96', 'E192'))
+
+Part = collections.namedtuple('Part', 'nominal tolerance inner')
+
+
+def part(value, q=None, tolerance=None, inner=None):
+    """ return a Part, value quantised to q, with q's tolerance unless another is given
+
+    q           a quantiser, or the name of a series, defaults to qE24
+    inner       for binned draws, how close to nominal the parts have been sorted out,
+                defaults to the next tighter standard tolerance
+
+    >>> part(4.8e3, 'E96')
+    Part(nominal=4750.0, tolerance=0.01, inner=0.005)
+    >>> part(0.18, 'E12', inner=0.02)
+    Part(nominal=0.18, tolerance=0.1, inner=0.02)
+    """
+    if q is None:
+        q = quantiser.qE24
+    elif isinstance(q, str):
+        q = quantiser.series(q)
+    if tolerance is None:
+        tolerance = q.tolerance
+    if tolerance is None:
+        raise ValueError('{!r} has no tolerance, give one'.format(q))
+    if inner is None:
+        inner = max([t for t in _TOLERANCES if t<tolerance], default=0.0)
+    if not 0<=inner<tolerance:
+        raise ValueError('need 0 <= inner < tolerance, got {!r} and {!r}'.format(inner, tolerance))
+    return Part(float(q.value(value)), tolerance, inner)
+
+
+def nominals(parts):
+    """ return a dict of the nominal values of a dict of parts, to run the network on"""
+    return {name: p.nominal for name, p in parts.items()}
+
+
+def divider(r1, r2):
+    """ r2/(r1+r2), a network for the examples, and one that can be sent to a process pool"""
+    return r2/(r1+r2)
+
+
+
+class Summary:
+    """ running count, mean, standard deviation, min and max of the values added to it
+
+    add() takes a whole array at once, and merge() another Summary, both with Chan's
+    update of the mean and sum of squared deviations, so nothing is kept but those
+
+    limits      (low, high), if given, outside counts the values beyond them
+
+    >>> s = Summary()
+    >>> s.add([1.0, 2.0, 3.0]); s.add([4.0])
+    >>> s.count, s.mean, round(s.std, 6), s.min, s.max
+    (4, 2.5, 1.290994, 1.0, 4.0)
+    """
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max', 'limits', 'outside')
+
+    def __init__(self, limits=None):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.limits = limits
+        self.outside = 0
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return
+        batch = Summary(self.limits)
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch._m2 = float(((values-batch.mean)**2).sum())
+        batch.min = float(values.min())
+        batch.max = float(values.max())
+        if self.limits is not None:
+            low, high = self.limits
+            batch.outside = int(np.count_nonzero((values<low) | (values>high)))
+        self.merge(batch)
+
+    def merge(self, other):
+        """ add in the values that other has summarised"""
+        if not other.count:
+            return
+        count = self.count+other.count
+        delta = other.mean-self.mean
+        self.mean += delta*other.count/count
+        self._m2 += other._m2+delta*delta*self.count*other.count/count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.outside += other.outside
+
+    @property
+    def variance(self):
+        """ the sample variance"""
+        if self.count<2:
+            return math.nan
+        return self._m2/(self.count-1)
+
+    @property
+    def std(self):
+        """ the sample standard deviation"""
+        return math.sqrt(self.variance)
+
+    def __repr__(self):
+        text = '<Summary count={} mean={:.6g} std={:.6g} min={:.6g} max={:.6g}'.format(
+                self.count, self.mean, self.std, self.min, self.max)
+        if self.limits is not None:
+            text += ' outside={}'.format(self.outside)
+        return text+'>'
+
+
+
+def draw(rng, p, size, distribution='uniform', sigmas=3):
+    """ return a numpy array of size values of the Part p, drawn with the numpy Generator rng
+
+    uniform     evenly over nominal*(1 +- tolerance)
+    gaussian    with the tolerance at sigmas standard deviations, and not clipped
+    binned      as gaussian, but only those from inner to tolerance away from nominal
+    """
+    if distribution=='uniform':
+        deviation = rng.uniform(-p.tolerance, p.tolerance, size)
+    elif distribution=='gaussian':
+        deviation = rng.normal(0.0, p.tolerance/sigmas, size)
+    elif distribution=='binned':
+        deviation = np.empty(size)
+        filled = 0
+        while filled<size:
+            more = rng.normal(0.0, p.tolerance/sigmas, 2*(size-filled)+16)
+            more = more[(np.abs(more)>=p.inner) & (np.abs(more)<=p.tolerance)][:size-filled]
+            deviation[filled:filled+len(more)] = more
+            filled += len(more)
+    else:
+        raise ValueError('distribution must be one of {}, got {!r}'.format(DISTRIBUTIONS, distribution))
+    return p.nominal*(1+deviation)
+
+
+
+def simulate(network, parts, trials=100000, distribution='uniform', seed=None,
+             chunksize=65536, workers=1, sigmas=3, limits=None):
+    """ return a Summary of network(**values) over trials draws of every part
+
+    network         a function of numpy arrays, called with the parts as keywords, that returns
+                    an array of results, or a tuple of arrays, when a tuple of Summaries is returned
+    parts           a dict of name: Part
+    distribution    'uniform', 'gaussian' or 'binned', see draw()
+    seed            for numpy's SeedSequence, each chunk of trials gets its own child of it,
+                    so the same seed and chunksize give the same results with any workers
+    workers         1 runs the chunks here, more spread them over a process pool,
+                    None for one per CPU, network must then be a module level function
+    limits          (low, high), to count the results outside them, see Summary
+
+    >>> parts = {'r1': part(10e3, 'E96'), 'r2': part(4.99e3, 'E96')}
+    >>> s = simulate(divider, parts, trials=200000, seed=1, limits=(0.331, 0.335))
+    >>> s.count, round(s.mean, 4), round(s.std, 5), s.outside
+    (200000, 0.3329, 0.00182, 60789)
+    >>> repr(s)==repr(simulate(divider, parts, trials=200000, seed=1, limits=(0.331, 0.335), workers=2))
+    True
+    """
+    for name, p in parts.items():
+        if not isinstance(p, Part):
+            raise ValueError('{} should be a Part, got {!r}'.format(name, p))
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError('distribution must be one of {}, got {!r}'.format(DISTRIBUTIONS, distribution))
+
+    sizes = [chunksize]*(trials//chunksize)
+    if trials%chunksize:
+        sizes.append(trials%chunksize)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(network, parts, size, child, distribution, sigmas, limits) for size, child in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers==1 or len(jobs)<2:
+        results = [_run_chunk(*job) for job in jobs]
+    else:
+        import concurrent.futures      # a slow import, so only when there's a pool to start
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, *zip(*jobs)))
+
+    total = None
+    single = True
+    for summaries, was_single in results:
+        single = was_single
+        if total is None:
+            total = [Summary(limits) for _ in summaries]
+        for running, chunk in zip(total, summaries):
+            running.merge(chunk)
+    if total is None:
+        total = [Summary(limits)]
+    if single:
+        return total[0]
+    return tuple(total)
+
+
+
+def _run_chunk(network, parts, size, seed, distribution, sigmas, limits):
+    """ one chunk for simulate(), returning (summaries, single), single if network returned one array"""
+    rng = np.random.default_rng(seed)
+    values = {name: draw(rng, p, size, distribution, sigmas) for name, p in parts.items()}
+    result = network(**values)
+    single = not isinstance(result, tuple)
+    if single:
+        result = (result,)
+    summaries = []
+    for r in result:
+        s = Summary(limits)
+        s.add(r)
+        summaries.append(s)
+    return summaries, single
+
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(verbose=True)